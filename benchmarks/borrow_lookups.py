@@ -0,0 +1,81 @@
+"""Per-request latency of borrow, return and borrow lookups as the borrow history grows.
+
+    python -m benchmarks.borrow_lookups --sizes 10000,100000,1000000,10000000
+
+The repository is built from generated records and writes are discarded, so
+the numbers cover the in-memory work of each endpoint plus, for borrow and
+return, the hand-off to the writer thread. Users and books grow with the
+history (10 borrows per user, 100 per book) so that the per-user and per-book
+results keep the same size k. "scan" is the cost of one pass over every
+borrow, which is what each of these requests paid before the borrow indexes.
+"""
+import argparse
+import asyncio
+import gc
+import random
+import time
+from server.api_borrow_return import check_borrow
+from server.repository import Repository
+from .data import MemoryStorage, make_books, make_users, make_borrows, percentile, print_table
+
+BORROWS_PER_USER = 10
+BORROWS_PER_BOOK = 100
+
+async def measure(repo: Repository, requests: int, rng: random.Random):
+    samples = {"borrow": [], "return": [], "by user": [], "by book": [], "active loan": []}
+    for _ in range(requests):
+        user_id, book_id = rng.choice(repo.user_ids), rng.choice(repo.book_ids)
+        if repo.active_loan(user_id, book_id) is not None:
+            continue
+
+        start = time.perf_counter()
+        check_borrow(repo, user_id, book_id)
+        borrow = await repo.borrow(user_id, book_id)
+        samples["borrow"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        repo.active_loan(user_id, book_id)
+        samples["active loan"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        repo.user_borrows(user_id)
+        samples["by user"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        repo.book_borrows(book_id)
+        samples["by book"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await repo.return_borrow(borrow["borrow_id"])
+        samples["return"].append(time.perf_counter() - start)
+    return samples
+
+def scan_time(repo: Repository, user_id: int):
+    start = time.perf_counter()
+    sum(1 for borrow in repo.borrows.values() if borrow.user_id == user_id)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated borrow history sizes")
+    parser.add_argument("--requests", type=int, default=2000, help="Borrow/return pairs measured per size")
+    args = parser.parse_args()
+
+    rows = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        books, users = max(1, size // BORROWS_PER_BOOK), max(1, size // BORROWS_PER_USER)
+        repo = Repository(MemoryStorage(make_books(books), make_users(users), make_borrows(size, books, users)))
+        gc.collect()
+        samples = asyncio.run(measure(repo, args.requests, random.Random(size)))
+        row = [f"{size:,}"]
+        for values in samples.values():
+            row.append(f"{percentile(values, 0.5) * 1e6:.1f} / {percentile(values, 0.99) * 1e6:.1f}")
+        row.append(f"{scan_time(repo, 1) * 1e3:.1f} ms")
+        rows.append(row)
+        del repo
+
+    print("Latency in microseconds, median / p99")
+    print_table(["borrows", *samples, "scan"], rows)
+
+if __name__ == "__main__":
+    main()
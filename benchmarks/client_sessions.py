@@ -0,0 +1,71 @@
+"""Per-call latency of the client package against a running server.
+
+    python main.py
+    python -m benchmarks.client_sessions --calls 2000
+
+Compares a fresh requests.request call per request (a new TCP connection each
+time, as the clients did before they shared a session) with the pooled
+keep-alive session of BaseClient, and with the async client issuing the same
+calls concurrently. Only GET /book/{id} is used, so the database is not
+modified.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import requests
+from .data import percentile, print_table
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "client"))
+
+from async_client import AsyncBookManagementClient
+from book_management import BookManagementClient
+
+def time_calls(call, book_ids: list[int]):
+    samples = []
+    for book_id in book_ids:
+        start = time.perf_counter()
+        call(book_id)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def fresh_connection(base_url: str):
+    def call(book_id: int):
+        resp = requests.request('GET', f"{base_url}/{book_id}", timeout=5)
+        resp.raise_for_status()
+        return resp.json()
+    return call
+
+async def time_async(base_url: str, book_ids: list[int]):
+    async with AsyncBookManagementClient(base_url) as client:
+        await client.get_book(book_ids[0])
+        start = time.perf_counter()
+        # get_books_many drops repeated ids, so every call is issued directly.
+        await client._gather(client.get_book, book_ids)
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL")
+    parser.add_argument("--calls", type=int, default=1000, help="Requests per client")
+    args = parser.parse_args()
+
+    base_url = f"{args.url}/book"
+    with BookManagementClient(base_url) as client:
+        book_ids = [book['id'] for book in client.iter_books(fields=['id'])]
+        book_ids = [book_ids[i % len(book_ids)] for i in range(args.calls)]
+
+        results = {
+            "new connection per call": time_calls(fresh_connection(base_url), book_ids),
+            "pooled session": time_calls(client.get_book, book_ids),
+        }
+    async_elapsed = asyncio.run(time_async(base_url, book_ids))
+
+    rows = [[name, f"{percentile(samples, 0.5) * 1e3:.2f}", f"{percentile(samples, 0.99) * 1e3:.2f}", f"{sum(samples):.2f}"] for name, samples in results.items()]
+    rows.append(["async client, concurrent", "-", "-", f"{async_elapsed:.2f}"])
+    print(f"{args.calls} x GET /book/{{id}}, latency in milliseconds")
+    print_table(["client", "p50", "p99", "total s"], rows)
+
+if __name__ == "__main__":
+    main()
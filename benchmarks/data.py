@@ -0,0 +1,96 @@
+import random
+import time
+from datetime import date
+from helpers import read_db, write_db
+from helpers.records import Borrow, BorrowStatus
+from helpers.storage import Storage, TextStorage
+from helpers.write_db import format_book, format_user, format_borrow
+
+TODAY = date.today().toordinal()
+HISTORY_DAYS = 5 * 365
+LOAN_DAYS = 14
+
+def make_books(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [{
+        "id": book_id,
+        "title": f"Title {book_id}",
+        "author": f"Author {rng.randint(1, max(1, count // 5))}",
+        "isbn": f"978{book_id:010d}",
+        "published_year": rng.randint(1900, 2025),
+        "available_copies": 1_000_000,
+    } for book_id in range(1, count + 1)]
+
+def make_users(count: int):
+    return [{
+        "id": user_id,
+        "username": f"user{user_id}",
+        "full_name": f"User {user_id}",
+        "email": f"user{user_id}@example.com",
+    } for user_id in range(1, count + 1)]
+
+def make_borrows(count: int, books: int, users: int, active_ratio: float = 0.01, seed: int = 3):
+    """Borrow history in chronological order; the newest `active_ratio` of rows are still on loan."""
+    rng = random.Random(seed)
+    active_from = count - int(count * active_ratio)
+    active_pairs = set()
+    borrows = []
+    for borrow_id in range(1, count + 1):
+        day = TODAY - HISTORY_DAYS + (borrow_id * HISTORY_DAYS) // count
+        user_id, book_id = rng.randint(1, users), rng.randint(1, books)
+        if borrow_id > active_from and (user_id, book_id) not in active_pairs:
+            active_pairs.add((user_id, book_id))
+            borrows.append(Borrow.from_days(borrow_id, user_id, book_id, day, day + LOAN_DAYS, None, BorrowStatus.BORROWED))
+        else:
+            borrows.append(Borrow.from_days(borrow_id, user_id, book_id, day, day + LOAN_DAYS, day + rng.randint(1, LOAN_DAYS), BorrowStatus.RETURNED))
+    return borrows
+
+def write_database(directory, books: list, users: list, borrows: list):
+    for name, formatter, records in (("books.txt", format_book, books), ("users.txt", format_user, users), ("borrows.txt", format_borrow, borrows)):
+        with open(directory / name, "w", encoding="utf-8") as file:
+            file.writelines(f"{formatter(record)}\n" for record in records)
+
+def use_database_dir(directory):
+    """Point the text storage helpers at `directory` instead of database/."""
+    paths = {name: str(directory / f"{name}.txt") for name in ("books", "users", "borrows")}
+    TextStorage.files = {entity: (paths[entity], formatter) for entity, (_, formatter) in TextStorage.files.items()}
+    read_db.BOOKS_FILE, read_db.USERS_FILE, read_db.BORROWS_FILE = paths["books"], paths["users"], paths["borrows"]
+    write_db.DATABASE_DIR = str(directory)
+    write_db.JOURNAL_FILE = str(directory / "transaction.journal")
+
+class MemoryStorage(Storage):
+    """Serves generated records and discards writes, so only in-memory work is measured."""
+
+    def __init__(self, books: list, users: list, borrows: list):
+        self.books = books
+        self.users = users
+        self.borrows = borrows
+
+    def load_books(self):
+        return self.books
+
+    def load_users(self):
+        return self.users
+
+    def load_borrows(self):
+        return self.borrows
+
+    def prepare(self, changes, tables):
+        return []
+
+    def apply(self, prepared):
+        pass
+
+def percentile(samples: list[float], fraction: float):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def print_table(headers: list[str], rows: list[list]):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers, ["-" * width for width in widths], *rows]:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
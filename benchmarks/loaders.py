@@ -0,0 +1,53 @@
+"""Load time of borrows.txt: the old helpers.read_db loader against the streaming parser.
+
+    python -m benchmarks.loaders --rows 1000000 --repeat 3
+
+Also times the optional binary columnar snapshot (LMS_COLUMNAR_SNAPSHOT=1),
+which replaces parsing on startup while the text file is unchanged. The last
+column extrapolates each loader linearly to 10M rows.
+"""
+import argparse
+import gc
+import tempfile
+from pathlib import Path
+from helpers.columnar import read_columnar, source_stamp, write_columnar
+from helpers.read_db import parse_borrow, read_records
+from . import legacy_read_db
+from .data import make_borrows, print_table, timed, write_database
+
+def best_of(repeat: int, load):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        elapsed, records = timed(load)
+        times.append(elapsed)
+        del records
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Borrow rows to load")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per loader; the fastest is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        books, users = max(1, args.rows // 100), max(1, args.rows // 10)
+        write_database(directory, [], [], make_borrows(args.rows, books, users))
+        path = str(directory / "borrows.txt")
+        snapshot = str(directory / "borrows.bin")
+        stamp = source_stamp(path)
+        write_columnar(snapshot, "borrows", list(read_records(path, parse_borrow)), stamp)
+
+        results = {
+            "old read_db.load_borrows": best_of(args.repeat, lambda: legacy_read_db.load_borrows(path)),
+            "streaming read_records": best_of(args.repeat, lambda: list(read_records(path, parse_borrow))),
+            "columnar snapshot": best_of(args.repeat, lambda: read_columnar(snapshot, "borrows", stamp)),
+        }
+
+    rows = [[name, f"{elapsed:.2f}", f"{args.rows / elapsed:,.0f}", f"{elapsed * 10_000_000 / args.rows:.0f}"] for name, elapsed in results.items()]
+    print(f"Loading {args.rows:,} borrow rows")
+    print_table(["loader", "seconds", "rows/s", "10M est. s"], rows)
+
+if __name__ == "__main__":
+    main()
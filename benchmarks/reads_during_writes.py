@@ -0,0 +1,93 @@
+"""Read latency on the event loop while borrows and returns are being written.
+
+    python -m benchmarks.reads_during_writes --borrows 500000 --mode snapshot
+
+A reader task wakes every millisecond and looks up a user's borrows; its
+latency is how late it woke plus the lookup, so any time the event loop spends
+blocked on storage shows up here. Three phases are measured against a real
+text database in a temporary directory: no writes, writes through the
+repository's writer thread, and the same writes applied directly on the event
+loop, which is how every write was done before the writer existed.
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+from helpers.storage import TextStorage
+from server.api_borrow_return import check_borrow
+from server.repository import Repository
+from .data import make_books, make_users, make_borrows, percentile, print_table, use_database_dir, write_database
+
+READ_INTERVAL = 0.001
+
+async def reader(repo: Repository, stop: asyncio.Event, samples: list, rng: random.Random):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(READ_INTERVAL)
+        repo.user_borrows(rng.choice(repo.user_ids))
+        samples.append(time.perf_counter() - start - READ_INTERVAL)
+
+async def writer(repo: Repository, writes: int, rng: random.Random):
+    for _ in range(writes):
+        user_id, book_id = rng.choice(repo.user_ids), rng.choice(repo.book_ids)
+        if check_borrow(repo, user_id, book_id) == 201:
+            borrow = await repo.borrow(user_id, book_id)
+            await repo.return_borrow(borrow["borrow_id"])
+        # Stands in for the network I/O between one client's requests.
+        await asyncio.sleep(0)
+
+async def apply_on_loop(repo: Repository, changes: list):
+    repo.storage.apply(repo.storage.prepare(changes, repo.tables))
+
+async def phase(repo: Repository, writers: int, writes: int, duration: float):
+    stop = asyncio.Event()
+    samples = []
+    read = asyncio.create_task(reader(repo, stop, samples, random.Random(1)))
+    start = time.perf_counter()
+    if writers:
+        await asyncio.gather(*(writer(repo, writes, random.Random(seed)) for seed in range(writers)))
+    else:
+        await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await read
+    return samples, elapsed
+
+async def run(args):
+    repo = Repository(TextStorage(args.mode))
+    await repo.start()
+    try:
+        results = {"idle": await phase(repo, 0, 0, 2.0)}
+        results["writer thread"] = await phase(repo, args.writers, args.writes, 0)
+        repo.writer.submit = lambda changes: apply_on_loop(repo, changes)
+        results["on event loop"] = await phase(repo, args.writers, args.writes, 0)
+        del repo.writer.submit
+    finally:
+        await repo.stop()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--borrows", type=int, default=200_000, help="Rows in borrows.txt")
+    parser.add_argument("--mode", choices=["snapshot", "log"], default="snapshot", help="Text storage mode")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writing clients")
+    parser.add_argument("--writes", type=int, default=20, help="Borrow/return pairs per writing client")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        books, users = max(1, args.borrows // 100), max(1, args.borrows // 10)
+        write_database(directory, make_books(books), make_users(users), make_borrows(args.borrows, books, users))
+        use_database_dir(directory)
+        results = asyncio.run(run(args))
+
+    rows = []
+    for name, (samples, elapsed) in results.items():
+        rows.append([name, len(samples), f"{percentile(samples, 0.5) * 1e3:.2f}", f"{percentile(samples, 0.99) * 1e3:.2f}", f"{max(samples) * 1e3:.2f}", f"{elapsed:.1f}"])
+    print(f"Read latency in milliseconds, {args.borrows:,} borrows, {args.mode} mode")
+    print_table(["phase", "reads", "p50", "p99", "max", "seconds"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Memory per borrow row: the old dict records against helpers.records.Borrow.
+
+    python -m benchmarks.record_memory --rows 1000000
+
+A generated borrows.txt is loaded with each loader under tracemalloc. "retained"
+is what the loaded list keeps alive, divided by the row count; "peak" is the
+highest allocation seen while loading.
+"""
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from pathlib import Path
+from helpers.read_db import parse_borrow, read_records
+from . import legacy_read_db
+from .data import make_borrows, print_table, write_database
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    records = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(records), retained, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Borrow rows to load")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        books, users = max(1, args.rows // 100), max(1, args.rows // 10)
+        write_database(directory, [], [], make_borrows(args.rows, books, users))
+        path = str(directory / "borrows.txt")
+        results = {
+            "dict (before)": measure(lambda: legacy_read_db.load_borrows(path)),
+            "Borrow (after)": measure(lambda: list(read_records(path, parse_borrow))),
+        }
+
+    rows = [[name, f"{count:,}", f"{retained / count:.0f}", f"{retained / 2**20:.1f}", f"{peak / 2**20:.1f}"] for name, (count, retained, peak) in results.items()]
+    print_table(["records", "rows", "bytes/row", "retained MiB", "peak MiB"], rows)
+
+if __name__ == "__main__":
+    main()
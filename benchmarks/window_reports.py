@@ -0,0 +1,50 @@
+"""Most-borrowed-in-the-last-N-days: BorrowLeaderboard against the NumPy columns.
+
+    python -m benchmarks.window_reports --rows 10000000
+
+Both implementations are built from the same generated borrow history and
+must return identical rankings; the script stops if they differ. Requires
+NumPy (pip install "numpy>=2").
+"""
+import argparse
+import gc
+from server.columns import BorrowColumns, np
+from server.leaderboard import BorrowLeaderboard
+from .data import TODAY, make_borrows, print_table, timed
+
+WINDOWS = (7, 30, 90, 365)
+
+def best_of(repeat: int, function, *args):
+    results = [timed(function, *args) for _ in range(repeat)]
+    return min(elapsed for elapsed, _ in results), results[0][1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Borrow rows")
+    parser.add_argument("--limit", type=int, default=10, help="Books per ranking")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per report; the fastest is reported")
+    args = parser.parse_args()
+    if np is None:
+        parser.error("NumPy is not installed")
+
+    borrows = make_borrows(args.rows, max(1, args.rows // 100), max(1, args.rows // 10))
+    leaderboard = BorrowLeaderboard()
+    for borrow in borrows:
+        leaderboard.record(borrow.book_id, borrow.borrow_day)
+    columns = BorrowColumns.build(borrows)
+    del borrows
+    gc.collect()
+
+    rows = []
+    for days in WINDOWS:
+        python_time, expected = best_of(args.repeat, leaderboard.top_window, args.limit, days, TODAY)
+        numpy_time, actual = best_of(args.repeat, columns.top_window, args.limit, days, TODAY)
+        if actual != expected:
+            raise SystemExit(f"Rankings differ for a {days}-day window:\n{expected}\n{actual}")
+        rows.append([days, f"{python_time * 1e3:.1f}", f"{numpy_time * 1e3:.1f}"])
+
+    print(f"top {args.limit} over {args.rows:,} borrows, milliseconds (rankings identical)")
+    print_table(["days", "leaderboard", "numpy"], rows)
+
+if __name__ == "__main__":
+    main()
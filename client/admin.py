@@ -1,32 +1,57 @@
-import requests
+import json
+from base_client import BaseClient
+
+class AdminClient(BaseClient):
+    def __init__(self, base_url, timeout=5, session=None):
+        super().__init__(base_url, timeout, session)
+        self._reports = {}
+
+    def _get_report(self, path, params=None):
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._reports.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        resp = self._send('GET', path, params=params, headers=headers)
+        if resp.status_code == 304:
+            return cached[1]
+
+        report = resp.json()
+        if 'ETag' in resp.headers:
+            self._reports[key] = (resp.headers['ETag'], report)
+        return report
 
-class AdminClient:
-    def __init__(self, base_url, timeout=5):
-        self.base_url = base_url
-        self.timeout = timeout
-    
-    def _request(self, method, path, **kwargs):
-        url = f"{self.base_url}{path}"
-        kwargs.setdefault('timeout', self.timeout)
-        try:
-            resp = requests.request(method, url, **kwargs)
-            resp.raise_for_status()
-            return None if resp.status_code == 204 else resp.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {e}")
-    
     def get_all_reports(self):
-        return self._request('GET', '/reports')
+        return self._get_report('/reports')
     
-    def get_overdue_books(self):
-        return self._request('GET', '/reports/overdue')
+    def get_summary(self, verify=False):
+        params = {'verify': 'true'} if verify else None
+        return self._get_report('/reports/summary', params=params)
+
+    def stream_reports(self):
+        resp = self._send('GET', '/reports/stream', stream=True)
+        with resp:
+            for line in resp.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def get_overdue_books(self, offset=0, limit=None):
+        params = {'offset': offset}
+        if limit:
+            params['limit'] = limit
+        return self._get_report('/reports/overdue', params=params)
     
-    def get_most_borrowed_books(self):
-        return self._request('GET', '/reports/most-borrowed')
+    def get_most_borrowed_books(self, limit=10, days=None):
+        params = {'limit': limit}
+        if days:
+            params['days'] = days
+        return self._get_report('/reports/most-borrowed', params=params)
     
+    def iter_borrowing_history(self, user_id=None, page_size=100, fields=None):
+        params = {'user_id': user_id} if user_id else {}
+        for page in self._paginate('/reports/history', page_size, fields, **params):
+            yield from page
+
     def get_borrowing_history(self, user_id=None):
-        params = {'user_id': user_id} if user_id else None
-        return self._request('GET', '/reports/history', params=params)
+        return list(self.iter_borrowing_history(user_id))
 
 def print_summary(summary):
     print("LIBRARY MANAGEMENT SYSTEM - SUMMARY REPORT".center(60))
@@ -37,6 +62,15 @@ def print_summary(summary):
     print(f"Returned Borrows: {summary.get('returned_borrows')}")
     print(f"Total Copies Available: {summary.get('total_copies_available', 'N/A')}")
 
+def print_book_row(book):
+    print(f"Book ID: {book.get('id')} | Title: {book.get('title')} | Author: {book.get('author')} | ISBN: {book.get('isbn')} | Published Year: {book.get('published_year')} | Available Copies: {book.get('available_copies')}")
+
+def print_user_row(user):
+    print(f"User ID: {user.get('id')} | Username: {user.get('username')} | Full Name: {user.get('full_name')} | Email: {user.get('email')}")
+
+def print_borrow_row(borrow):
+    print(f"Borrow ID: {borrow.get('borrow_id')} | User ID: {borrow.get('user_id')} | Book ID: {borrow.get('book_id')} | Borrow Date: {borrow.get('borrow_date')} | Due Date: {borrow.get('due_date')} | Return Date: {borrow.get('return_date') or 'Not returned yet'} | Status: {borrow.get('status')}")
+
 def print_books_report(books):
     print("BOOKS REPORT".center(60))
     if not books:
@@ -44,7 +78,7 @@ def print_books_report(books):
         return
     
     for book in books:
-        print(f"Book ID: {book.get('id')} | Title: {book.get('title')} | Author: {book.get('author')} | ISBN: {book.get('isbn')} | Published Year: {book.get('published_year')} | Available Copies: {book.get('available_copies')}")
+        print_book_row(book)
         
 
 def print_users_report(users):
@@ -54,7 +88,7 @@ def print_users_report(users):
         return
     
     for user in users:
-        print(f"User ID: {user.get('id')} | Username: {user.get('username')} | Full Name: {user.get('full_name')} | Email: {user.get('email')}")
+        print_user_row(user)
 
 def print_borrows_report(borrows):
     print("BORROWS REPORT".center(60))
@@ -63,7 +97,7 @@ def print_borrows_report(borrows):
         return
     
     for borrow in borrows:
-        print(f"Borrow ID: {borrow.get('borrow_id')} | User ID: {borrow.get('user_id')} | Book ID: {borrow.get('book_id')} | Borrow Date: {borrow.get('borrow_date')} | Due Date: {borrow.get('due_date')} | Return Date: {borrow.get('return_date') or 'Not returned yet'} | Status: {borrow.get('status')}")
+        print_borrow_row(borrow)
 
 def print_overdue_report(overdue_books):
     print("OVERDUE BOOKS REPORT".center(60))
@@ -92,7 +126,28 @@ def print_borrowing_history(history):
     for item in history:
         print(f"Borrow ID: {item.get('borrow_id')} | User: {item.get('username')} (ID: {item.get('user_id')}) | Book: {item.get('book_title')} (ID: {item.get('book_id')}) | Borrow Date: {item.get('borrow_date')} | Due Date: {item.get('due_date')} | Return Date: {item.get('return_date') or 'Not returned yet'} | Status: {item.get('status')}")
 
+def print_report_stream(rows):
+    headers = {"book": "BOOKS REPORT", "user": "USERS REPORT", "borrow": "BORROWS REPORT"}
+    printers = {"book": print_book_row, "user": print_user_row, "borrow": print_borrow_row}
+    current = None
+
+    for row in rows:
+        kind = row.get('type')
+        if kind == 'summary':
+            print_summary(row['data'])
+            continue
+        if kind not in printers:
+            continue
+        if kind != current:
+            print(headers[kind].center(60))
+            current = kind
+        printers[kind](row['data'])
+
 def print_full_report(report_data):
+    if not isinstance(report_data, dict):
+        print_report_stream(report_data)
+        return
+
     if 'summary' in report_data:
         print_summary(report_data['summary'])
     
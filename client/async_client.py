@@ -0,0 +1,165 @@
+import asyncio
+import httpx
+
+def make_async_client(pool_size=20, timeout=5):
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+class AsyncBaseClient:
+    def __init__(self, base_url, timeout=5, client=None, concurrency=20):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.client = client or make_async_client(concurrency, timeout)
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _send(self, method, path, **kwargs):
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+            resp.raise_for_status()
+            return resp
+        except httpx.HTTPError as e:
+            raise Exception(f"Request failed: {e}")
+
+    async def _request(self, method, path, **kwargs):
+        resp = await self._send(method, path, **kwargs)
+        return None if resp.status_code == 204 else resp.json()
+
+    async def _paginate(self, path, page_size, fields=None, **params):
+        params['limit'] = page_size
+        if fields:
+            params['fields'] = ','.join(fields)
+
+        while True:
+            resp = await self._send('GET', path, params=params)
+            yield resp.json()
+            cursor = resp.headers.get('X-Next-Cursor')
+            if cursor is None:
+                return
+            params['cursor'] = cursor
+
+    async def _gather(self, func, items):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+class AsyncBookManagementClient(AsyncBaseClient):
+    async def add_book(self, title, author, isbn, published_year, available_copies):
+        return await self._request('POST', '/', json={'title': title, 'author': author, 'isbn': isbn, 'published_year': published_year, 'available_copies': available_copies})
+
+    async def get_book(self, book_id):
+        return await self._request('GET', f'/{book_id}')
+
+    async def get_books_many(self, book_ids):
+        book_ids = list(dict.fromkeys(book_ids))
+        return dict(zip(book_ids, await self._gather(self.get_book, book_ids)))
+
+    async def update_book(self, book_id, **fields):
+        update_data = {k: v for k, v in fields.items() if v is not None}
+        return await self._request('PUT', f'/{book_id}', json=update_data)
+
+    async def delete_book(self, book_id):
+        await self._request('DELETE', f'/{book_id}')
+
+    async def iter_books(self, page_size=100, fields=None):
+        async for page in self._paginate('/', page_size, fields):
+            for book in page.values():
+                yield book
+
+    async def search_books(self, query, limit=20, offset=0):
+        return await self._request('GET', '/search', params={'q': query, 'limit': limit, 'offset': offset})
+
+class AsyncUserManagementClient(AsyncBaseClient):
+    async def add_user(self, username, full_name, email):
+        return await self._request('POST', '/', json={'username': username, 'full_name': full_name, 'email': email})
+
+    async def get_user(self, user_id):
+        return await self._request('GET', f'/{user_id}')
+
+    async def get_users_many(self, user_ids):
+        user_ids = list(dict.fromkeys(user_ids))
+        return dict(zip(user_ids, await self._gather(self.get_user, user_ids)))
+
+    async def update_user(self, user_id, **fields):
+        update_data = {k: v for k, v in fields.items() if v is not None}
+        return await self._request('PUT', f'/{user_id}', json=update_data)
+
+    async def delete_user(self, user_id):
+        await self._request('DELETE', f'/{user_id}')
+
+    async def iter_users(self, page_size=100, fields=None):
+        async for page in self._paginate('/', page_size, fields):
+            for user in page.values():
+                yield user
+
+class AsyncBorrowReturnClient(AsyncBaseClient):
+    async def borrow_book(self, user_id, book_id):
+        return await self._request('POST', '/', json={'user_id': user_id, 'book_id': book_id})
+
+    async def return_book(self, user_id, book_id):
+        return await self._request('POST', '/return', json={'user_id': user_id, 'book_id': book_id})
+
+    async def borrow_many(self, loans, atomic=False):
+        return await self._request('POST', '/batch', params={'atomic': 'true'} if atomic else None, json=[{'user_id': user_id, 'book_id': book_id} for user_id, book_id in loans])
+
+    async def return_many(self, loans, atomic=False):
+        return await self._request('POST', '/return/batch', params={'atomic': 'true'} if atomic else None, json=[{'user_id': user_id, 'book_id': book_id} for user_id, book_id in loans])
+
+    async def iter_borrows(self, page_size=100, fields=None):
+        async for page in self._paginate('/', page_size, fields):
+            for borrow in page:
+                yield borrow
+
+    async def track_user_borrows(self, user_id):
+        return await self._request('GET', f'/user/{user_id}')
+
+    async def track_users_borrows_many(self, user_ids):
+        user_ids = list(dict.fromkeys(user_ids))
+        return dict(zip(user_ids, await self._gather(self.track_user_borrows, user_ids)))
+
+    async def borrows_by_book(self, book_id):
+        return await self._request('GET', f'/book/{book_id}')
+
+    async def check_book_availability(self, book_id):
+        return await self._request('GET', f'/check-availability/{book_id}')
+
+    async def check_availability_many(self, book_ids):
+        book_ids = list(dict.fromkeys(book_ids))
+        return dict(zip(book_ids, await self._gather(self.check_book_availability, book_ids)))
+
+class AsyncAdminClient(AsyncBaseClient):
+    async def get_summary(self, verify=False):
+        params = {'verify': 'true'} if verify else None
+        return await self._request('GET', '/reports/summary', params=params)
+
+    async def get_overdue_books(self, offset=0, limit=None):
+        params = {'offset': offset}
+        if limit:
+            params['limit'] = limit
+        return await self._request('GET', '/reports/overdue', params=params)
+
+    async def get_most_borrowed_books(self, limit=10, days=None):
+        params = {'limit': limit}
+        if days:
+            params['days'] = days
+        return await self._request('GET', '/reports/most-borrowed', params=params)
+
+    async def iter_borrowing_history(self, user_id=None, page_size=100, fields=None):
+        params = {'user_id': user_id} if user_id else {}
+        async for page in self._paginate('/reports/history', page_size, fields, **params):
+            for entry in page:
+                yield entry
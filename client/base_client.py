@@ -0,0 +1,53 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def make_session(pool_size=10, retries=3, backoff=0.3):
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class BaseClient:
+    def __init__(self, base_url, timeout=5, session=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = session or make_session()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _send(self, method, path, **kwargs):
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            resp = self.session.request(method, url, **kwargs)
+            resp.raise_for_status()
+            return resp
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {e}")
+
+    def _request(self, method, path, **kwargs):
+        resp = self._send(method, path, **kwargs)
+        return None if resp.status_code == 204 else resp.json()
+
+    def _paginate(self, path, page_size, fields=None, **params):
+        params['limit'] = page_size
+        if fields:
+            params['fields'] = ','.join(fields)
+
+        while True:
+            resp = self._send('GET', path, params=params)
+            yield resp.json()
+            cursor = resp.headers.get('X-Next-Cursor')
+            if cursor is None:
+                return
+            params['cursor'] = cursor
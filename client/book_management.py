@@ -1,24 +1,14 @@
-import requests
-
-class BookManagementClient:
-    def __init__(self, base_url, timeout=5):
-        self.base_url = base_url
-        self.timeout = timeout
-
-    def _request(self, method, path, **kwargs):
-        url = f"{self.base_url}{path}"
-        kwargs.setdefault('timeout', self.timeout)
-
-        try:
-            resp = requests.request(method, url, **kwargs)
-            resp.raise_for_status()
-            return None if resp.status_code == 204 else resp.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {e}")
+from base_client import BaseClient
 
+class BookManagementClient(BaseClient):
     def add_book(self, title, author, isbn, published_year, available_copies):
         return self._request('POST', '/', json={'title': title, 'author': author, 'isbn': isbn, 'published_year': published_year, 'available_copies': available_copies})
 
+    def bulk_add(self, path):
+        content_type = 'text/csv' if path.lower().endswith('.csv') else 'application/x-ndjson'
+        with open(path, 'rb') as f:
+            return self._request('POST', '/bulk', data=f, headers={'Content-Type': content_type}, timeout=None)
+
     def get_book(self, book_id):
         return self._request('GET', f'/{book_id}')
 
@@ -29,8 +19,15 @@ class BookManagementClient:
     def delete_book(self, book_id):
         self._request('DELETE', f'/{book_id}')
 
+    def iter_books(self, page_size=100, fields=None):
+        for page in self._paginate('/', page_size, fields):
+            yield from page.values()
+
     def list_books(self):
-        return self._request( 'GET', '/')
+        return {book['id']: book for book in self.iter_books()}
+
+    def search_books(self, query, limit=20, offset=0):
+        return self._request('GET', '/search', params={'q': query, 'limit': limit, 'offset': offset})
 
 def print_book(book, book_id=None):
     print(f"ID: {book_id} | Title: {book.get('title')} | Author: {book.get('author')} | ISBN: {book.get('isbn')} | Published Year: {book.get('published_year')} | Available Copies: {book.get('available_copies')}")
@@ -1,28 +1,24 @@
-import requests
-
-class BorrowReturnClient:
-    def __init__(self, base_url, timeout=5):
-        self.base_url = base_url
-        self.timeout = timeout
-
-    def _request(self, method, path, **kwargs):
-        url = f"{self.base_url}{path}"
-        kwargs.setdefault('timeout', self.timeout)
-        try:
-            resp = requests.request(method, url, **kwargs)
-            resp.raise_for_status()
-            return None if resp.status_code == 204 else resp.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {e}")
+from base_client import BaseClient
 
+class BorrowReturnClient(BaseClient):
     def borrow_book(self, user_id, book_id):
         return self._request('POST', '/', json={'user_id': user_id, 'book_id': book_id})
 
     def return_book(self, user_id, book_id):
         return self._request('POST', '/return', json={'user_id': user_id, 'book_id': book_id})
 
+    def borrow_many(self, loans, atomic=False):
+        return self._request('POST', '/batch', params={'atomic': 'true'} if atomic else None, json=[{'user_id': user_id, 'book_id': book_id} for user_id, book_id in loans])
+
+    def return_many(self, loans, atomic=False):
+        return self._request('POST', '/return/batch', params={'atomic': 'true'} if atomic else None, json=[{'user_id': user_id, 'book_id': book_id} for user_id, book_id in loans])
+
+    def iter_borrows(self, page_size=100, fields=None):
+        for page in self._paginate('/', page_size, fields):
+            yield from page
+
     def list_borrows(self):
-        return self._request('GET', '/')
+        return list(self.iter_borrows())
 
     def track_user_borrows(self, user_id):
         return self._request('GET', f'/user/{user_id}')
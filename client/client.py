@@ -1,14 +1,17 @@
 import os
+from base_client import make_session
 from book_management import BookManagementClient, print_book
 from user_management import UserManagementClient, print_user
 from borrow_return import BorrowReturnClient, print_borrow
 from admin import (AdminClient, print_full_report, print_summary, print_overdue_report, print_most_borrowed_report, print_borrowing_history)
 
+session = make_session()
+
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
 def book_management_menu():
-    client = BookManagementClient("http://127.0.0.1:8000/book")
+    client = BookManagementClient("http://127.0.0.1:8000/book", session=session)
     
     while True:
         clear_screen()
@@ -184,7 +187,7 @@ def book_management_menu():
             input("Press Enter to continue... ")
 
 def user_management_menu():
-    client = UserManagementClient("http://127.0.0.1:8000/user")
+    client = UserManagementClient("http://127.0.0.1:8000/user", session=session)
     
     while True:
         clear_screen()
@@ -386,7 +389,7 @@ def user_management_menu():
             input("Press Enter to continue... ")
 
 def borrow_return_menu():
-    client = BorrowReturnClient("http://127.0.0.1:8000/borrow")
+    client = BorrowReturnClient("http://127.0.0.1:8000/borrow", session=session)
     
     while True:
         clear_screen()
@@ -511,7 +514,7 @@ def borrow_return_menu():
             input("Press Enter to continue... ")
 
 def admin_reports_menu():
-    client = AdminClient("http://127.0.0.1:8000/admin")
+    client = AdminClient("http://127.0.0.1:8000/admin", session=session)
     
     while True:
         clear_screen()
@@ -534,17 +537,16 @@ def admin_reports_menu():
         try:
             if cmd == '1':
                 try:
-                    report = client.get_all_reports()
-                    print_full_report(report)
+                    print_full_report(client.stream_reports())
                 except Exception as e:
                     print("Error: Failed to retrieve system report.")
                     print(f"Details: {e}")
             
             elif cmd == '2':
                 try:
-                    report = client.get_all_reports()
-                    if report and 'summary' in report:
-                        print_summary(report['summary'])
+                    summary = client.get_summary()
+                    if summary:
+                        print_summary(summary)
                     else:
                         print("Error: Summary data not available.")
                 except Exception as e:
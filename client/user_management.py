@@ -1,24 +1,14 @@
-import requests
-
-class UserManagementClient:
-    def __init__(self, base_url, timeout=5):
-        self.base_url = base_url
-        self.timeout = timeout
-
-    def _request(self, method, path, **kwargs):
-        url = f"{self.base_url}{path}"
-        kwargs.setdefault('timeout', self.timeout)
-        
-        try:
-            resp = requests.request(method, url, **kwargs)
-            resp.raise_for_status()
-            return None if resp.status_code == 204 else resp.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Request failed: {e}")
+from base_client import BaseClient
 
+class UserManagementClient(BaseClient):
     def add_user(self, username, full_name, email):
         return self._request('POST','/', json={'username': username, 'full_name': full_name, 'email': email})
 
+    def bulk_add(self, path):
+        content_type = 'text/csv' if path.lower().endswith('.csv') else 'application/x-ndjson'
+        with open(path, 'rb') as f:
+            return self._request('POST', '/bulk', data=f, headers={'Content-Type': content_type}, timeout=None)
+
     def get_user(self, user_id):
         return self._request('GET', f'/{user_id}')
 
@@ -30,8 +20,12 @@ class UserManagementClient:
     def delete_user(self, user_id):
         self._request('DELETE', f'/{user_id}')
 
+    def iter_users(self, page_size=100, fields=None):
+        for page in self._paginate('/', page_size, fields):
+            yield from page.values()
+
     def list_users(self):
-        return self._request('GET','/')
+        return {user['id']: user for user in self.iter_users()}
 
 def print_user(user, user_id=None):
     print(f"ID: {user_id} | Username: {user.get('username')} | Full Name: {user.get('full_name')} | Email: {user.get('email')}")
\ No newline at end of file
@@ -1,3 +1,7 @@
-from .paths import BOOKS_FILE, USERS_FILE, BORROWS_FILE
+from .config import STORAGE_BACKEND, STORAGE_MODE, COMPACTION_INTERVAL, WRITE_BATCH_WINDOW_MS, WRITE_BATCH_SIZE, WORKERS, COLUMNAR_SNAPSHOT
+from .paths import BOOKS_FILE, USERS_FILE, BORROWS_FILE, JOURNAL_FILE, SQLITE_FILE, log_path
+from .records import Borrow, BorrowStatus
 from .read_db import load_books, load_users, load_borrows
-from .write_db import write_records
\ No newline at end of file
+from .write_db import write_records, apply_changes, recover_pending_writes, compact_log, start_compactor, format_book, format_user, format_borrow
+from .storage import Storage, TextStorage, open_storage
+from .writer import AsyncWriter
@@ -0,0 +1,133 @@
+import gc
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from .records import Borrow, BorrowStatus, intern_days
+
+MAGIC = b"LMSCOL1" + (b"L" if sys.byteorder == "little" else b"B")
+HEADER = struct.Struct("=8sqqqqq")
+NULL = -(1 << 63)
+
+SCHEMAS = {
+    "books": (("id", "i"), ("title", "s"), ("author", "s"), ("isbn", "s"), ("published_year", "i"), ("available_copies", "i")),
+    "users": (("id", "i"), ("username", "s"), ("full_name", "s"), ("email", "s")),
+    "borrows": (("borrow_id", "i"), ("user_id", "i"), ("book_id", "i"), ("borrow_day", "i"), ("due_day", "i"), ("return_day", "i"), ("status", "s")),
+}
+
+def _values(entity: str, record):
+    if entity == "borrows":
+        return (record.borrow_id, record.user_id, record.book_id, record.borrow_day, record.due_day, record.return_day, record.status.value)
+    return tuple(record[name] for name, _ in SCHEMAS[entity])
+
+def _build(entity: str, columns: list[list]):
+    if entity == "borrows":
+        borrow_ids, user_ids, book_ids, borrow_days, due_days, return_days, statuses = columns
+        lookup = {status: BorrowStatus(status) for status in set(statuses)}
+        return list(map(
+            Borrow.from_days, borrow_ids, user_ids, book_ids,
+            intern_days(borrow_days), intern_days(due_days), intern_days(return_days),
+            [lookup[status] for status in statuses],
+        ))
+    names = [name for name, _ in SCHEMAS[entity]]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+def source_stamp(source: str):
+    try:
+        stat = os.stat(source)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+def write_columnar(path: str, entity: str, records: list, stamp: tuple[int, int, int]):
+    schema = SCHEMAS[entity]
+    strings = {}
+    columns = [array("q") for _ in schema]
+    for record in records:
+        for (_, kind), column, value in zip(schema, columns, _values(entity, record)):
+            if value is None:
+                column.append(NULL)
+            elif kind == "s":
+                column.append(strings.setdefault(value, len(strings)))
+            else:
+                column.append(value)
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = array("q", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    blob = b"".join(encoded)
+    blob += b"\0" * (-len(blob) % 8)
+
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    with os.fdopen(fd, "wb") as file:
+        file.write(HEADER.pack(MAGIC, *stamp, len(records), len(strings)))
+        file.write(offsets.tobytes())
+        file.write(blob)
+        for column in columns:
+            file.write(column.tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+def columnar_stamp(path: str):
+    try:
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, source_size, source_mtime, source_ino, _, _ = HEADER.unpack(header)
+    return (source_size, source_mtime, source_ino) if magic == MAGIC else None
+
+def read_columnar(path: str, entity: str, stamp: tuple[int, int, int]):
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with file:
+        size = os.fstat(file.fileno()).st_size
+        if size < HEADER.size:
+            return None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, source_size, source_mtime, source_ino, rows, count = HEADER.unpack_from(data)
+            if magic != MAGIC or (source_size, source_mtime, source_ino) != tuple(stamp):
+                return None
+
+            with memoryview(data) as view:
+                position = HEADER.size
+                with view[position:position + (count + 1) * 8].cast("q") as offsets_view:
+                    offsets = offsets_view.tolist()
+                position += (count + 1) * 8
+                blob_size = offsets[-1] + (-offsets[-1] % 8)
+                if size != position + blob_size + rows * 8 * len(SCHEMAS[entity]):
+                    return None
+
+                blob = bytes(view[position:position + offsets[-1]])
+                strings = [blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+                position += blob_size
+
+                columns = []
+                for _, kind in SCHEMAS[entity]:
+                    with view[position:position + rows * 8].cast("q") as column_view:
+                        column = column_view.tolist()
+                    position += rows * 8
+                    if kind == "s":
+                        column = [None if value == NULL else strings[value] for value in column]
+                    elif NULL in column:
+                        column = [None if value == NULL else value for value in column]
+                    columns.append(column)
+
+    # Building millions of records would otherwise trigger repeated full
+    # collections that find nothing to free.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build(entity, columns)
+    finally:
+        if enabled:
+            gc.enable()
@@ -0,0 +1,22 @@
+import os
+
+# "text" keeps data in database/*.txt, "sqlite" in database/library.db.
+STORAGE_BACKEND = os.getenv("LMS_STORAGE_BACKEND", "text")
+
+# "snapshot" rewrites the whole .txt file on every change, "log" appends each
+# change to a per-entity .log file that is compacted back into the snapshot.
+STORAGE_MODE = os.getenv("LMS_STORAGE_MODE", "snapshot")
+COMPACTION_INTERVAL = float(os.getenv("LMS_COMPACTION_INTERVAL", "30"))
+
+# Writes arriving within this window (or until the batch is full) are flushed
+# together with a single fsync per file.
+WRITE_BATCH_WINDOW_MS = float(os.getenv("LMS_WRITE_BATCH_WINDOW_MS", "5"))
+WRITE_BATCH_SIZE = int(os.getenv("LMS_WRITE_BATCH_SIZE", "100"))
+
+# Number of server processes; more than one requires the sqlite backend so
+# workers can share state through the database.
+WORKERS = int(os.getenv("LMS_WORKERS", "1"))
+
+# Keep a binary columnar copy of each .txt snapshot (database/*.bin) that is
+# loaded instead of parsing the text file while the text file is unchanged.
+COLUMNAR_SNAPSHOT = os.getenv("LMS_COLUMNAR_SNAPSHOT", "0") == "1"
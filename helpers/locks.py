@@ -0,0 +1,27 @@
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class InterProcessLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a+b")
+
+    def acquire(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def release(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        self._file.close()
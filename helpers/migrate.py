@@ -0,0 +1,34 @@
+import argparse
+import os
+from .paths import SQLITE_FILE
+from .read_db import load_books, load_users, load_borrows
+from .sqlite_db import SQLiteStorage
+from .write_db import recover_pending_writes
+
+def migrate(target: str = SQLITE_FILE):
+    if os.path.exists(target):
+        raise FileExistsError(f"{target} already exists")
+
+    recover_pending_writes()
+    storage = SQLiteStorage(target)
+    counts = {}
+    try:
+        for entity, loader in (("books", load_books), ("users", load_users), ("borrows", load_borrows)):
+            records = loader()
+            storage.import_records(entity, records)
+            counts[entity] = len(records)
+    finally:
+        storage.stop()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy database/*.txt into a SQLite database")
+    parser.add_argument("--target", default=SQLITE_FILE, help="Path of the SQLite database to create")
+    args = parser.parse_args()
+
+    counts = migrate(args.target)
+    for entity, count in counts.items():
+        print(f"{entity}: {count} records")
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,15 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATABASE_DIR = os.path.join(BASE_DIR, "database")
 BOOKS_FILE = os.path.join(DATABASE_DIR, "books.txt")
 USERS_FILE = os.path.join(DATABASE_DIR, "users.txt")
-BORROWS_FILE = os.path.join(DATABASE_DIR, "borrows.txt")
\ No newline at end of file
+BORROWS_FILE = os.path.join(DATABASE_DIR, "borrows.txt")
+JOURNAL_FILE = os.path.join(DATABASE_DIR, "transaction.journal")
+SQLITE_FILE = os.path.join(DATABASE_DIR, "library.db")
+
+def log_path(path: str):
+    return os.path.splitext(path)[0] + ".log"
+
+def columnar_path(path: str):
+    return os.path.splitext(path)[0] + ".bin"
+
+def compacting_path(path: str):
+    return log_path(path) + ".compacting"
@@ -1,61 +1,101 @@
-from .paths import BOOKS_FILE, USERS_FILE, BORROWS_FILE
+import logging
+import os
+from .paths import BOOKS_FILE, USERS_FILE, BORROWS_FILE, log_path, compacting_path
+from .records import Borrow
 
-def _read_lines(path: str):
+logger = logging.getLogger(__name__)
+
+READ_BUFFER_SIZE = 1 << 20
+
+def _iter_lines(path: str):
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            return [line.strip() for line in file if line.strip()]
+        file = open(path, "r", encoding="utf-8", buffering=READ_BUFFER_SIZE)
     except FileNotFoundError:
-        return []
-
-def load_books():
-    lines = _read_lines(BOOKS_FILE)
-    books = []
-
-    for line in lines:
-        parts = line.split("|")
-        books.append({
-            "id": int(parts[0]),
-            "title": parts[1],
-            "author": parts[2],
-            "isbn": parts[3],
-            "published_year": int(parts[4]),
-            "available_copies": int(parts[5])
-        })
-
-    return books
-
-def load_users():
-    lines = _read_lines(USERS_FILE)
-    users = []
-
-    for line in lines:
-        parts = line.split("|")
-        users.append({
-            "id": int(parts[0]),
-            "username": parts[1],
-            "full_name": parts[2],
-            "email": parts[3],
-        })
-
-    return users
-
-def load_borrows():
-    lines = _read_lines(BORROWS_FILE)
-    borrows = []
-
-    for line in lines:
-        parts = line.strip().split("|")
-        if len(parts) < 7:
-            continue
-
-        borrows.append({
-            "borrow_id": int(parts[0]),
-            "user_id": int(parts[1]),
-            "book_id": int(parts[2]),
-            "borrow_date": parts[3],
-            "due_date": parts[4],
-            "return_date": parts[5] if parts[5] not in (None, "", "None") else None,
-            "status": parts[6]
-        })
-
-    return borrows
\ No newline at end of file
+        return
+    with file:
+        for line_no, line in enumerate(file, 1):
+            line = line.strip()
+            if line:
+                yield line_no, line
+
+def _fields(line: str, count: int):
+    parts = line.split("|")
+    if len(parts) < count:
+        raise ValueError(f"expected {count} fields, got {len(parts)}")
+    return parts
+
+def parse_book(line: str):
+    parts = _fields(line, 6)
+    return {
+        "id": int(parts[0]),
+        "title": parts[1],
+        "author": parts[2],
+        "isbn": parts[3],
+        "published_year": int(parts[4]),
+        "available_copies": int(parts[5])
+    }
+
+def parse_user(line: str):
+    parts = _fields(line, 4)
+    return {
+        "id": int(parts[0]),
+        "username": parts[1],
+        "full_name": parts[2],
+        "email": parts[3],
+    }
+
+def parse_borrow(line: str):
+    return Borrow(*_fields(line, 7)[:7])
+
+def _parse(parse, path: str, line_no: int, line: str, errors: list | None):
+    try:
+        return parse(line)
+    except ValueError as e:
+        if errors is None:
+            logger.warning("%s:%d: skipping malformed line %r (%s)", path, line_no, line, e)
+        else:
+            errors.append((path, line_no, line, str(e)))
+        return None
+
+def read_records(path: str, parse, errors: list | None = None, live: bool = True):
+    logs = [compacting_path(path)] + ([log_path(path)] if live else [])
+    logs = [log for log in logs if os.path.exists(log)]
+    if not logs:
+        for line_no, line in _iter_lines(path):
+            record = _parse(parse, path, line_no, line, errors)
+            if record is not None:
+                yield record
+        return
+
+    records = {}
+    for line_no, line in _iter_lines(path):
+        record = _parse(parse, path, line_no, line, errors)
+        if record is not None:
+            records[line.split("|", 1)[0]] = record
+    for log in logs:
+        for line_no, line in _iter_lines(log):
+            op, _, payload = line.partition("|")
+            key = payload.split("|", 1)[0]
+            if not key:
+                continue
+            if op == "+":
+                # A malformed update is reported and skipped, keeping the
+                # last valid version of the record.
+                record = _parse(parse, log, line_no, payload, errors)
+                if record is not None:
+                    records[key] = record
+            elif op == "-":
+                records.pop(key, None)
+    yield from records.values()
+
+def _read_lines(path: str, live: bool = True):
+    return list(read_records(path, str, live=live))
+
+def load_books(errors: list | None = None):
+    return list(read_records(BOOKS_FILE, parse_book, errors))
+
+def load_users(errors: list | None = None):
+    return list(read_records(USERS_FILE, parse_user, errors))
+
+def load_borrows(errors: list | None = None):
+    return list(read_records(BORROWS_FILE, parse_borrow, errors))
@@ -0,0 +1,94 @@
+from collections.abc import MutableMapping
+from datetime import date
+from enum import Enum
+
+class BorrowStatus(Enum):
+    BORROWED = "borrowed"
+    RETURNED = "returned"
+
+_statuses = {status.value: status for status in BorrowStatus}
+_ordinals = {}
+_dates = {}
+_days = {}
+
+def to_ordinal(value: str | None) -> int | None:
+    if not value or value == "None":
+        return None
+    ordinal = _ordinals.get(value)
+    if ordinal is None:
+        ordinal = _ordinals[value] = _day(date.fromisoformat(value).toordinal())
+        _dates.setdefault(ordinal, date.fromordinal(ordinal).isoformat())
+    return ordinal
+
+def _day(ordinal: int | None) -> int | None:
+    return None if ordinal is None else _days.setdefault(ordinal, ordinal)
+
+def intern_days(ordinals: list) -> list:
+    days = {ordinal: _day(ordinal) for ordinal in set(ordinals)}
+    return [days[ordinal] for ordinal in ordinals]
+
+def from_ordinal(ordinal: int | None) -> str | None:
+    if ordinal is None:
+        return None
+    value = _dates.get(ordinal)
+    if value is None:
+        value = _dates[ordinal] = date.fromordinal(ordinal).isoformat()
+    return value
+
+class Borrow(MutableMapping):
+    __slots__ = ("borrow_id", "user_id", "book_id", "borrow_day", "due_day", "return_day", "status")
+
+    fields = ("borrow_id", "user_id", "book_id", "borrow_date", "due_date", "return_date", "status")
+    days = {"borrow_date": "borrow_day", "due_date": "due_day", "return_date": "return_day"}
+
+    def __init__(self, borrow_id: int, user_id: int, book_id: int, borrow_date: str, due_date: str, return_date: str | None = None, status: str = "borrowed"):
+        self.borrow_id = int(borrow_id)
+        self.user_id = int(user_id)
+        self.book_id = int(book_id)
+        self.borrow_day = to_ordinal(borrow_date)
+        self.due_day = to_ordinal(due_date)
+        self.return_day = to_ordinal(return_date)
+        self.status = _statuses.get(status) or BorrowStatus(status)
+
+    @classmethod
+    def from_days(cls, borrow_id: int, user_id: int, book_id: int, borrow_day: int, due_day: int, return_day: int | None, status: BorrowStatus):
+        borrow = cls.__new__(cls)
+        borrow.borrow_id = borrow_id
+        borrow.user_id = user_id
+        borrow.book_id = book_id
+        borrow.borrow_day = borrow_day
+        borrow.due_day = due_day
+        borrow.return_day = return_day
+        borrow.status = status
+        return borrow
+
+    def __getitem__(self, key: str):
+        if key in self.days:
+            return from_ordinal(getattr(self, self.days[key]))
+        if key == "status":
+            return self.status.value
+        if key in self.fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in self.days:
+            setattr(self, self.days[key], to_ordinal(value))
+        elif key == "status":
+            self.status = _statuses.get(value) or BorrowStatus(value)
+        elif key in self.fields:
+            setattr(self, key, int(value))
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key: str):
+        raise TypeError("Borrow fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __repr__(self):
+        return f"Borrow({dict(self)!r})"
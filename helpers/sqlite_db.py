@@ -0,0 +1,161 @@
+import sqlite3
+import threading
+from .locks import InterProcessLock
+from .records import Borrow
+from .storage import Storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    author TEXT,
+    isbn TEXT,
+    published_year INTEGER,
+    available_copies INTEGER
+);
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT,
+    full_name TEXT,
+    email TEXT
+);
+CREATE TABLE IF NOT EXISTS borrows (
+    borrow_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    book_id INTEGER NOT NULL,
+    borrow_date TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    return_date TEXT,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_isbn ON books (isbn);
+CREATE INDEX IF NOT EXISTS users_username ON users (username);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+CREATE INDEX IF NOT EXISTS borrows_user ON borrows (user_id);
+CREATE INDEX IF NOT EXISTS borrows_book ON borrows (book_id);
+CREATE INDEX IF NOT EXISTS borrows_status_due ON borrows (status, due_date);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL,
+    key INTEGER NOT NULL
+);
+"""
+
+CHANGE_RETENTION = 100_000
+POLL_CHUNK_SIZE = 500
+
+COLUMNS = {
+    "books": ("id", "title", "author", "isbn", "published_year", "available_copies"),
+    "users": ("id", "username", "full_name", "email"),
+    "borrows": Borrow.fields,
+}
+
+def _record(entity: str, row: tuple):
+    return Borrow(*row) if entity == "borrows" else dict(zip(COLUMNS[entity], row))
+
+class SQLiteStorage(Storage):
+    def __init__(self, path: str, shared: bool = False):
+        self.path = path
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+
+        self._process_lock = InterProcessLock(path + ".lock") if shared else None
+        self._reader = sqlite3.connect(path, check_same_thread=False, timeout=30) if shared else None
+        self.last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def stop(self, tables=None):
+        with self._lock:
+            self._conn.close()
+        if self.shared:
+            self._reader.close()
+            self._process_lock.close()
+
+    def acquire_lock(self):
+        if self.shared:
+            self._process_lock.acquire()
+
+    def release_lock(self):
+        if self.shared:
+            self._process_lock.release()
+
+    def poll_changes(self):
+        if not self.shared:
+            return []
+
+        rows = self._reader.execute("SELECT seq, entity, key FROM changes WHERE seq > ? ORDER BY seq", (self.last_seq,)).fetchall()
+        if not rows:
+            return []
+
+        oldest = self._reader.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+        missed = oldest > self.last_seq + 1
+        self.last_seq = rows[-1][0]
+        if missed:
+            return None
+
+        changed = list(dict.fromkeys((entity, key) for _, entity, key in rows))
+        records = {}
+        for entity in dict.fromkeys(entity for entity, _ in changed):
+            columns = COLUMNS[entity]
+            keys = [key for changed_entity, key in changed if changed_entity == entity]
+            for start in range(0, len(keys), POLL_CHUNK_SIZE):
+                chunk = keys[start:start + POLL_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                for row in self._reader.execute(f"SELECT {', '.join(columns)} FROM {entity} WHERE {columns[0]} IN ({placeholders})", chunk):
+                    records[(entity, row[0])] = _record(entity, row)
+        return [(entity, key, records.get((entity, key))) for entity, key in changed]
+
+    def _load(self, entity: str):
+        columns = COLUMNS[entity]
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(columns)} FROM {entity} ORDER BY {columns[0]}").fetchall()
+        return [_record(entity, row) for row in rows]
+
+    def load_books(self):
+        return self._load("books")
+
+    def load_users(self):
+        return self._load("users")
+
+    def load_borrows(self):
+        return self._load("borrows")
+
+    def prepare(self, changes, tables):
+        prepared = {}
+        for entity, key in changes:
+            record = tables[entity].get(key)
+            if record is None:
+                prepared[(entity, key)] = ("delete", entity, key)
+            else:
+                prepared[(entity, key)] = ("put", entity, tuple(record.get(column) for column in COLUMNS[entity]))
+        return list(prepared.values())
+
+    def apply(self, prepared):
+        with self._lock, self._conn:
+            for kind, entity, payload in prepared:
+                columns = COLUMNS[entity]
+                if kind == "put":
+                    placeholders = ", ".join("?" for _ in columns)
+                    self._conn.execute(f"INSERT OR REPLACE INTO {entity} ({', '.join(columns)}) VALUES ({placeholders})", payload)
+                else:
+                    self._conn.execute(f"DELETE FROM {entity} WHERE {columns[0]} = ?", (payload,))
+
+            if self.shared and prepared:
+                self._conn.executemany(
+                    "INSERT INTO changes (entity, key) VALUES (?, ?)",
+                    [(entity, payload[0] if kind == "put" else payload) for kind, entity, payload in prepared],
+                )
+                self.last_seq = self._conn.execute("SELECT MAX(seq) FROM changes").fetchone()[0]
+                self._conn.execute("DELETE FROM changes WHERE seq <= ?", (self.last_seq - CHANGE_RETENTION,))
+
+    def import_records(self, entity: str, records: list[dict]):
+        columns = COLUMNS[entity]
+        placeholders = ", ".join("?" for _ in columns)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {entity} ({', '.join(columns)}) VALUES ({placeholders})",
+                (tuple(record.get(column) for column in columns) for record in records),
+            )
@@ -0,0 +1,168 @@
+import os
+import threading
+from .columnar import read_columnar, write_columnar, columnar_stamp, source_stamp
+from .config import STORAGE_BACKEND, STORAGE_MODE, COMPACTION_INTERVAL, WORKERS, COLUMNAR_SNAPSHOT
+from .paths import BOOKS_FILE, USERS_FILE, BORROWS_FILE, SQLITE_FILE, log_path, compacting_path, columnar_path
+from .read_db import load_books, load_users, load_borrows, read_records, parse_book, parse_user, parse_borrow
+from .write_db import apply_changes, recover_pending_writes, compact_log, start_compactor, format_book, format_user, format_borrow
+
+class Storage:
+    shared = False
+
+    def start(self):
+        pass
+
+    def stop(self, tables: dict[str, dict] | None = None):
+        pass
+
+    def reset(self):
+        pass
+
+    def load_books(self) -> list[dict]:
+        raise NotImplementedError
+
+    def load_users(self) -> list[dict]:
+        raise NotImplementedError
+
+    def load_borrows(self) -> list[dict]:
+        raise NotImplementedError
+
+    def prepare(self, changes: list[tuple[str, int]], tables: dict[str, dict]) -> list[tuple]:
+        raise NotImplementedError
+
+    def apply(self, prepared: list[tuple]):
+        raise NotImplementedError
+
+    def acquire_lock(self):
+        pass
+
+    def release_lock(self):
+        pass
+
+    def poll_changes(self) -> list[tuple[str, int, dict | None]] | None:
+        return []
+
+class TextStorage(Storage):
+    files = {
+        "books": (BOOKS_FILE, format_book),
+        "users": (USERS_FILE, format_user),
+        "borrows": (BORROWS_FILE, format_borrow),
+    }
+    parsers = {
+        "books": (parse_book, "id"),
+        "users": (parse_user, "id"),
+        "borrows": (parse_borrow, "borrow_id"),
+    }
+
+    def __init__(self, mode: str = STORAGE_MODE, columnar: bool = COLUMNAR_SNAPSHOT):
+        self.mode = mode
+        self.columnar = columnar
+        self._stop_compactor = None
+        self._rows = {}
+        self._apply_lock = threading.Lock()
+        recover_pending_writes()
+
+    def start(self):
+        for path, _ in self.files.values():
+            compact_log(path)
+        if self.mode == "log":
+            self._stop_compactor = start_compactor([path for path, _ in self.files.values()], COMPACTION_INTERVAL)
+
+    def stop(self, tables=None):
+        if self._stop_compactor is not None:
+            self._stop_compactor.set()
+            self._stop_compactor = None
+            for path, _ in self.files.values():
+                compact_log(path)
+
+        # Refresh the binary copies from the final in-memory tables so the
+        # next startup can use them even after this run took writes.
+        if self.columnar and tables is not None:
+            for entity, (path, _) in self.files.items():
+                stamp = source_stamp(path)
+                if stamp is not None and not os.path.exists(log_path(path)) and columnar_stamp(columnar_path(path)) != stamp:
+                    write_columnar(columnar_path(path), entity, list(tables[entity].values()), stamp)
+
+    def reset(self):
+        # After a failed write: finish (or discard) whatever reached the disk
+        # and forget cached rows, which may no longer match the files.
+        with self._apply_lock:
+            recover_pending_writes()
+            self._rows.clear()
+
+    def _load(self, entity: str, loader):
+        path, _ = self.files[entity]
+        stamp = source_stamp(path)
+        if not self.columnar or stamp is None or os.path.exists(log_path(path)) or os.path.exists(compacting_path(path)):
+            return loader()
+
+        records = read_columnar(columnar_path(path), entity, stamp)
+        if records is None:
+            records = loader()
+            write_columnar(columnar_path(path), entity, records, stamp)
+        return records
+
+    def load_books(self):
+        return self._load("books", load_books)
+
+    def load_users(self):
+        return self._load("users", load_users)
+
+    def load_borrows(self):
+        return self._load("borrows", load_borrows)
+
+    def prepare(self, changes, tables):
+        prepared = []
+        if self.mode == "log":
+            for entity, key in changes:
+                path, formatter = self.files[entity]
+                if key in tables[entity]:
+                    prepared.append(("put", path, formatter(tables[entity][key])))
+                else:
+                    prepared.append(("delete", path, key))
+        else:
+            # Only the changed rows are formatted here, on the event loop; the
+            # full snapshot is assembled in apply() from the cached rows.
+            rows = {}
+            for entity, key in changes:
+                _, formatter = self.files[entity]
+                record = tables[entity].get(key)
+                rows.setdefault(entity, {})[key] = None if record is None else formatter(record)
+            prepared = [("rows", entity, entity_rows) for entity, entity_rows in rows.items()]
+        return prepared
+
+    def _snapshot_rows(self, entity: str):
+        # Built with the loader's rules, so lines it skipped as malformed are
+        # dropped here too instead of failing every later write.
+        if entity not in self._rows:
+            path, formatter = self.files[entity]
+            parse, key = self.parsers[entity]
+            self._rows[entity] = {record[key]: formatter(record) for record in read_records(path, parse, errors=[])}
+        return self._rows[entity]
+
+    def apply(self, prepared):
+        with self._apply_lock:
+            snapshots = {}
+            for kind, entity, payload in prepared:
+                if kind != "rows":
+                    continue
+                if entity not in snapshots:
+                    snapshots[entity] = dict(self._snapshot_rows(entity))
+                for key, row in payload.items():
+                    if row is None:
+                        snapshots[entity].pop(key, None)
+                    else:
+                        snapshots[entity][key] = row
+
+            changes = [entry for entry in prepared if entry[0] != "rows"]
+            changes += [("write", self.files[entity][0], list(rows.values())) for entity, rows in snapshots.items()]
+            apply_changes(changes)
+            self._rows.update(snapshots)
+
+def open_storage(backend: str = STORAGE_BACKEND, workers: int = WORKERS) -> Storage:
+    if backend == "sqlite":
+        from .sqlite_db import SQLiteStorage
+        return SQLiteStorage(SQLITE_FILE, shared=workers > 1)
+    if workers > 1:
+        raise RuntimeError("Running more than one worker requires LMS_STORAGE_BACKEND=sqlite")
+    return TextStorage()
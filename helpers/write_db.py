@@ -1,6 +1,152 @@
-def write_records(path: str, rows: list[str]):
-    with open(path, "w", encoding="utf-8") as file:
+import os
+import tempfile
+import threading
+from .paths import DATABASE_DIR, JOURNAL_FILE, log_path, compacting_path
+from .read_db import _read_lines
+
+_log_lock = threading.Lock()
+_compact_lock = threading.Lock()
+
+def _fsync_dir(path: str):
+    if os.name == "nt":
+        return
+    fd = os.open(os.path.dirname(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _write_temp(path: str, rows: list[str]):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
         for row in rows:
             if not row.endswith("\n"):
                 row += "\n"
             file.write(row)
+        file.flush()
+        os.fsync(file.fileno())
+    return temp_path
+
+def write_records(path: str, rows: list[str]):
+    os.replace(_write_temp(path, rows), path)
+    _fsync_dir(path)
+
+def format_book(book: dict):
+    return f"{book['id']}|{book['title']}|{book['author']}|{book['isbn']}|{book['published_year']}|{book['available_copies']}"
+
+def format_user(user: dict):
+    return f"{user['id']}|{user['username']}|{user['full_name']}|{user['email']}"
+
+def format_borrow(borrow: dict):
+    return f"{borrow['borrow_id']}|{borrow['user_id']}|{borrow['book_id']}|{borrow['borrow_date']}|{borrow['due_date']}|{borrow['return_date'] or ''}|{borrow['status']}"
+
+def _truncate_torn_tail(path: str, chunk_size: int = 4096):
+    with open(path, "rb+") as file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            file.truncate(position)
+            file.flush()
+            os.fsync(file.fileno())
+
+def append_lines(path: str, lines: list[str], sync: bool = False):
+    with _log_lock:
+        with open(log_path(path), "a", encoding="utf-8") as file:
+            file.writelines(f"{line}\n" for line in lines)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+
+def _write_journal(renames: list[tuple[str, str]], appends: dict[str, list[str]]):
+    lines = [f"R|{temp_path}|{path}" for temp_path, path in renames]
+    lines += [f"A|{path}|{line}" for path, path_lines in appends.items() for line in path_lines]
+    os.replace(_write_temp(JOURNAL_FILE, lines), JOURNAL_FILE)
+    _fsync_dir(JOURNAL_FILE)
+
+def _read_journal():
+    renames = []
+    appends = {}
+    with open(JOURNAL_FILE, "r", encoding="utf-8") as file:
+        for line in file:
+            kind, first, second = line.rstrip("\n").split("|", 2)
+            if kind == "R":
+                renames.append((first, second))
+            elif kind == "A":
+                appends.setdefault(first, []).append(second)
+    return renames, appends
+
+def _apply_journal(renames: list[tuple[str, str]], appends: dict[str, list[str]]):
+    for temp_path, path in renames:
+        if os.path.exists(temp_path):
+            os.replace(temp_path, path)
+    if renames:
+        _fsync_dir(renames[0][1])
+
+    for path, lines in appends.items():
+        append_lines(path, lines, sync=True)
+
+    os.remove(JOURNAL_FILE)
+    _fsync_dir(JOURNAL_FILE)
+
+def apply_changes(changes: list[tuple]):
+    renames = []
+    appends = {}
+    for kind, path, payload in changes:
+        if kind == "write":
+            renames.append((_write_temp(path, payload), path))
+        elif kind == "put":
+            appends.setdefault(path, []).append(f"+|{payload}")
+        elif kind == "delete":
+            appends.setdefault(path, []).append(f"-|{payload}")
+
+    _write_journal(renames, appends)
+    _apply_journal(renames, appends)
+
+def recover_pending_writes():
+    with _compact_lock:
+        # A crash mid-append leaves a partial last line, which would otherwise
+        # be replayed as a real record (a torn "-|15" reads as "-|1").
+        for name in os.listdir(DATABASE_DIR):
+            if name.endswith(".log"):
+                _truncate_torn_tail(os.path.join(DATABASE_DIR, name))
+
+        if os.path.exists(JOURNAL_FILE):
+            _apply_journal(*_read_journal())
+
+        for name in os.listdir(DATABASE_DIR):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(DATABASE_DIR, name))
+
+def compact_log(path: str):
+    pending = compacting_path(path)
+    with _compact_lock:
+        with _log_lock:
+            if not os.path.exists(pending):
+                if not os.path.exists(log_path(path)) or os.path.getsize(log_path(path)) == 0:
+                    return False
+                os.replace(log_path(path), pending)
+
+        # The live log is still being appended to and is replayed on load,
+        # so only the snapshot and the frozen log are folded together.
+        write_records(path, _read_lines(path, live=False))
+        os.remove(pending)
+        return True
+
+def start_compactor(paths: list[str], interval: float):
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            for path in paths:
+                compact_log(path)
+
+    threading.Thread(target=run, name="log-compactor", daemon=True).start()
+    return stop
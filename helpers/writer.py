@@ -0,0 +1,87 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AsyncWriter:
+    def __init__(self, prepare, apply, window: float = 0.0, batch_size: int = 1, on_error=None):
+        self._prepare = prepare
+        self._apply = apply
+        self._on_error = on_error
+        self._window = window
+        self._batch_size = batch_size
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        self._task = None
+
+    async def submit(self, changes: list):
+        prepared = self._prepare(changes)
+        if self._task is None:
+            try:
+                await asyncio.to_thread(self._apply, prepared)
+            except Exception:
+                self._failed()
+                raise
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prepared, future))
+        await future
+
+    def _failed(self):
+        if self._on_error is None:
+            return
+        try:
+            self._on_error()
+        except Exception:
+            logger.exception("Recovering from a failed write failed")
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self._window
+
+        while len(batch) < self._batch_size:
+            timeout = deadline - loop.time()
+            try:
+                if timeout > 0:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except (TimeoutError, asyncio.QueueEmpty):
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            prepared = [entry for item, _ in batch for entry in item]
+            try:
+                await asyncio.to_thread(self._apply, prepared)
+                error = None
+            except Exception as e:
+                error = e
+                # Queued writes were made on top of the failed ones, so they
+                # are failed along with them.
+                while not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                self._failed()
+
+            for _, future in batch:
+                if not future.done():
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+                self._queue.task_done()
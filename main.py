@@ -1,7 +1,17 @@
+import argparse
+import os
 import uvicorn
 
 def main():
-    uvicorn.run("server.app:app", host="127.0.0.1", port=8000, reload=True)
+    parser = argparse.ArgumentParser(description="Run the library management server")
+    parser.add_argument("--workers", type=int, help="Run N worker processes without auto-reload (requires LMS_STORAGE_BACKEND=sqlite)")
+    args = parser.parse_args()
+
+    if args.workers:
+        os.environ["LMS_WORKERS"] = str(args.workers)
+        uvicorn.run("server.app:app", host="127.0.0.1", port=8000, workers=args.workers)
+    else:
+        uvicorn.run("server.app:app", host="127.0.0.1", port=8000, reload=True)
 
 if __name__ == "__main__":
     main()
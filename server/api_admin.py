@@ -1,70 +1,66 @@
-from fastapi import FastAPI, HTTPException
-from helpers.read_db import load_books, load_users, load_borrows
-from datetime import datetime
+import json
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Query
+from fastapi.responses import StreamingResponse
+from datetime import date
+from helpers.records import Borrow
 from typing import Optional
+from .leaderboard import MAX_WINDOW_DAYS
+from .pagination import PageParams, paginate, project
+from .report_cache import CapturedHeaders, ReportCache, etag_matches
+from .repository import Repository, get_repository
 
 app = FastAPI()
 
-def get_all_books_data():
-    books = load_books()
-    return books
+STREAM_CHUNK_SIZE = 500
 
-def get_all_users_data():
-    users = load_users()
-    return users
+report_cache = ReportCache()
 
-def get_all_borrows_data():
-    borrows = load_borrows()
-    return borrows
+def get_all_books_data(repo: Repository):
+    return list(repo.books.values())
 
-def get_overdue_books():
-    borrows = load_borrows()
-    books = load_books()
-    users = load_users()
-    
-    books_dict = {book["id"]: book for book in books}
-    users_dict = {user["id"]: user for user in users}
-    
+def get_all_users_data(repo: Repository):
+    return list(repo.users.values())
+
+def get_all_borrows_data(repo: Repository):
+    return [dict(borrow) for borrow in repo.borrows.values()]
+
+def get_overdue_books(repo: Repository, offset: int = 0, limit: Optional[int] = None):
     overdue_list = []
-    today = datetime.now().date()
+    today = date.today().toordinal()
+    total, loans = repo.overdue_loans(today, offset, limit)
     
-    for borrow in borrows:
-        if borrow["status"] == "borrowed":
-            due_date = datetime.strptime(borrow["due_date"], "%Y-%m-%d").date()
-            if due_date < today:
-                days_overdue = (today - due_date).days
-                book = books_dict.get(borrow["book_id"], {})
-                user = users_dict.get(borrow["user_id"], {})
-                
-                overdue_list.append({
-                    "borrow_id": borrow["borrow_id"],
-                    "user_id": borrow["user_id"],
-                    "username": user.get("username", "Unknown"),
-                    "book_id": borrow["book_id"],
-                    "book_title": book.get("title", "Unknown"),
-                    "borrow_date": borrow["borrow_date"],
-                    "due_date": borrow["due_date"],
-                    "days_overdue": days_overdue
-                })
+    for due, borrow in loans:
+        book = repo.books.get(borrow["book_id"], {})
+        user = repo.users.get(borrow["user_id"], {})
+        
+        overdue_list.append({
+            "borrow_id": borrow["borrow_id"],
+            "user_id": borrow["user_id"],
+            "username": user.get("username", "Unknown"),
+            "book_id": borrow["book_id"],
+            "book_title": book.get("title", "Unknown"),
+            "borrow_date": borrow["borrow_date"],
+            "due_date": borrow["due_date"],
+            "days_overdue": today - due
+        })
     
-    return overdue_list
+    return total, overdue_list
 
-def get_most_borrowed_books():
-    borrows = load_borrows()
-    books = load_books()
-    
-    books_dict = {book["id"]: book for book in books}
-    
-    borrow_count = {}
-    for borrow in borrows:
-        book_id = borrow["book_id"]
-        borrow_count[book_id] = borrow_count.get(book_id, 0) + 1
-    
-    sorted_books = sorted(borrow_count.items(), key=lambda x: x[1], reverse=True)
+# Short windows touch few days of the leaderboard and beat a full NumPy scan
+# (see benchmarks/window_reports.py).
+LEADERBOARD_MAX_WINDOW_DAYS = 30
+
+def get_most_borrowed_books(repo: Repository, limit: int = 10, days: Optional[int] = None):
+    if days is None:
+        ranked = repo.leaderboard.top(limit)
+    elif repo.borrow_columns is not None and days > LEADERBOARD_MAX_WINDOW_DAYS:
+        ranked = repo.borrow_columns.top_window(limit, days, date.today().toordinal())
+    else:
+        ranked = repo.leaderboard.top_window(limit, days, date.today().toordinal())
     
     result = []
-    for book_id, count in sorted_books[:10]: 
-        book = books_dict.get(book_id, {})
+    for book_id, count in ranked:
+        book = repo.books.get(book_id, {})
         result.append({
             "book_id": book_id,
             "title": book.get("title", "Unknown"),
@@ -74,79 +70,137 @@ def get_most_borrowed_books():
     
     return result
 
-def get_borrowing_history(user_id: Optional[int] = None):
-    borrows = load_borrows()
-    books = load_books()
-    users = load_users()
-    
-    books_dict = {book["id"]: book for book in books}
-    users_dict = {user["id"]: user for user in users}
-    
-    history = []
-    for borrow in borrows:
-        if user_id is None or borrow["user_id"] == user_id:
-            book = books_dict.get(borrow["book_id"], {})
-            user = users_dict.get(borrow["user_id"], {})
-            
-            history.append({
-                "borrow_id": borrow["borrow_id"],
-                "user_id": borrow["user_id"],
-                "username": user.get("username", "Unknown"),
-                "book_id": borrow["book_id"],
-                "book_title": book.get("title", "Unknown"),
-                "borrow_date": borrow["borrow_date"],
-                "due_date": borrow["due_date"],
-                "return_date": borrow.get("return_date"),
-                "status": borrow["status"]
-            })
-    
-    return history
+def get_history_ids(repo: Repository, user_id: Optional[int] = None):
+    if user_id is None:
+        return repo.borrow_ids
+    return repo.borrows_by_user.get(user_id, [])
+
+def get_history_entry(repo: Repository, borrow: Borrow):
+    book = repo.books.get(borrow["book_id"], {})
+    user = repo.users.get(borrow["user_id"], {})
+
+    return {
+        "borrow_id": borrow["borrow_id"],
+        "user_id": borrow["user_id"],
+        "username": user.get("username", "Unknown"),
+        "book_id": borrow["book_id"],
+        "book_title": book.get("title", "Unknown"),
+        "borrow_date": borrow["borrow_date"],
+        "due_date": borrow["due_date"],
+        "return_date": borrow.get("return_date"),
+        "status": borrow["status"]
+    }
+
+def get_borrowing_history(repo: Repository, user_id: Optional[int] = None):
+    return [get_history_entry(repo, repo.borrows[borrow_id]) for borrow_id in get_history_ids(repo, user_id)]
+
+def get_summary(repo: Repository):
+    return dict(repo.summary)
+
+def get_summary_drift(repo: Repository):
+    summary = get_summary(repo)
+    recomputed = repo.compute_summary()
+    drift = {key: summary[key] - value for key, value in recomputed.items() if summary[key] != value}
+
+    return {
+        "summary": summary,
+        "recomputed": recomputed,
+        "drift": drift,
+        "consistent": not drift
+    }
+
+def get_full_report(repo: Repository):
+    return {
+        "summary": get_summary(repo),
+        "books": get_all_books_data(repo),
+        "users": get_all_users_data(repo),
+        "borrows": get_all_borrows_data(repo)
+    }
+
+def cached_report(request: Request, response: Response, repo: Repository, key: tuple, compute):
+    version = repo.data_version()
+    if version is None:
+        return compute(response)
+
+    etag = f'"{version}-{date.today().toordinal()}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    def run():
+        captured = CapturedHeaders()
+        return compute(captured), captured.headers
+
+    body, headers = report_cache.get(etag, key, run)
+    response.headers.update(headers)
+    response.headers["ETag"] = etag
+    return body
+
+async def stream_report_rows(repo: Repository):
+    yield json.dumps({"type": "summary", "data": get_summary(repo)}) + "\n"
+
+    sections = (
+        ("book", repo.books, list(repo.book_ids)),
+        ("user", repo.users, list(repo.user_ids)),
+        ("borrow", repo.borrows, list(repo.borrow_ids)),
+    )
+    for kind, table, ids in sections:
+        for start in range(0, len(ids), STREAM_CHUNK_SIZE):
+            lines = [
+                json.dumps({"type": kind, "data": dict(table[record_id])}) + "\n"
+                for record_id in ids[start:start + STREAM_CHUNK_SIZE]
+                if record_id in table
+            ]
+            if lines:
+                yield "".join(lines)
 
 @app.get("/reports", response_model=dict, status_code=200)
-async def get_all_reports():
+async def get_all_reports(request: Request, response: Response, repo: Repository = Depends(get_repository)):
     """Get comprehensive admin report with all system data"""
     try:
-        books_data = get_all_books_data()
-        users_data = get_all_users_data()
-        borrows_list = get_all_borrows_data()
-        
-        active_borrows = sum(1 for b in borrows_list if b['status'] == 'borrowed')
-        returned_borrows = sum(1 for b in borrows_list if b['status'] == 'returned')
-        total_copies = sum(book["available_copies"] for book in books_data)
-        
-        return {
-            "summary": {
-                "total_books": len(books_data),
-                "total_users": len(users_data),
-                "total_borrows": len(borrows_list),
-                "active_borrows": active_borrows,
-                "returned_borrows": returned_borrows,
-                "total_copies_available": total_copies
-            },
-            "books": books_data,
-            "users": users_data,
-            "borrows": borrows_list
-        }
+        return cached_report(request, response, repo, ("reports",), lambda _: get_full_report(repo))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating report: {str(e)}")
 
+@app.get("/reports/summary", response_model=dict, status_code=200)
+async def get_summary_report(request: Request, response: Response, verify: bool = False, repo: Repository = Depends(get_repository)):
+    """Get summary statistics, optionally recomputed from scratch to report counter drift"""
+    try:
+        return cached_report(request, response, repo, ("summary", verify), lambda _: get_summary_drift(repo) if verify else get_summary(repo))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching summary: {str(e)}")
+
+@app.get("/reports/stream", status_code=200)
+async def stream_all_reports(repo: Repository = Depends(get_repository)):
+    """Stream the comprehensive admin report as newline-delimited JSON"""
+    return StreamingResponse(stream_report_rows(repo), media_type="application/x-ndjson")
+
 @app.get("/reports/overdue", response_model=list, status_code=200)
-async def get_overdue_report():
+async def get_overdue_report(request: Request, response: Response, offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1, le=1000), repo: Repository = Depends(get_repository)):
+    def compute(out):
+        total, overdue_list = get_overdue_books(repo, offset, limit)
+        out.headers["X-Total-Count"] = str(total)
+        return overdue_list
+
     try:
-        return get_overdue_books()
+        return cached_report(request, response, repo, ("overdue", offset, limit), compute)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching overdue books: {str(e)}")
 
 @app.get("/reports/most-borrowed", response_model=list, status_code=200)
-async def get_most_borrowed_report():
+async def get_most_borrowed_report(request: Request, response: Response, limit: int = Query(10, ge=1, le=100), days: Optional[int] = Query(None, ge=1, le=MAX_WINDOW_DAYS, description="Only count borrows from the last N days"), repo: Repository = Depends(get_repository)):
     try:
-        return get_most_borrowed_books()
+        return cached_report(request, response, repo, ("most-borrowed", limit, days), lambda _: get_most_borrowed_books(repo, limit, days))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching most borrowed books: {str(e)}")
 
 @app.get("/reports/history", response_model=list, status_code=200)
-async def get_borrowing_history_report(user_id: Optional[int] = None):
+async def get_borrowing_history_report(request: Request, response: Response, user_id: Optional[int] = None, page: PageParams = Depends(), repo: Repository = Depends(get_repository)):
+    def compute(out):
+        borrow_ids = paginate(get_history_ids(repo, user_id), page, out)
+        return [project(get_history_entry(repo, repo.borrows[borrow_id]), page.fields) for borrow_id in borrow_ids]
+
+    key = ("history", user_id, page.limit, page.cursor, tuple(page.fields or ()))
     try:
-        return get_borrowing_history(user_id)
+        return cached_report(request, response, repo, key, compute)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching borrowing history: {str(e)}")
@@ -1,8 +1,8 @@
-from fastapi import FastAPI, Query, Path, HTTPException
+from fastapi import FastAPI, Query, Path, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
-from helpers.paths import BOOKS_FILE
-from helpers.read_db import load_books
-from helpers.write_db import write_records
+from .bulk import read_batches
+from .pagination import PageParams, paginate, project
+from .repository import Repository, get_repository
 
 app = FastAPI()
 
@@ -13,70 +13,66 @@ class BookModel(BaseModel):
     published_year: int | None = None
     available_copies: int | None = None
 
-def load_book_db():
-    books = load_books()
-    return {book["id"]: book for book in books}
-
-book_db = load_book_db()
-
 @app.get("/", response_model=dict, status_code=200, description="Get all books")
-async def get_all_books():
-    return book_db
+async def get_all_books(response: Response, page: PageParams = Depends(), repo: Repository = Depends(get_repository)):
+    return {book_id: project(repo.books[book_id], page.fields) for book_id in paginate(repo.book_ids, page, response)}
+
+@app.get("/search", response_model=dict, status_code=200, description="Search books by title, author or ISBN")
+async def search_books(q: str = Query(..., min_length=1, description="Search terms"), limit: int = Query(20, ge=1, le=100), offset: int = Query(0, ge=0), repo: Repository = Depends(get_repository)):
+    total, book_ids = repo.book_search.search(q, limit, offset)
+    return {"total": total, "results": [repo.books[book_id] for book_id in book_ids]}
 
 @app.post("/", response_model=BookModel, status_code=201, description="Add a new book")
-async def add_book(book: BookModel):
-    for existing in book_db.values():
-        if existing.get("isbn") == book.isbn:
+async def add_book(book: BookModel, repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        if repo.isbn_taken(book.isbn):
             raise HTTPException(status_code=409, detail="Conflict")
 
-    new_id = max(book_db.keys()) + 1 if book_db else 1
-    book_db[new_id] = book.model_dump()
-
-    rows = [
-        f"{bid}|{b['title']}|{b['author']}|{b['isbn']}|{b['published_year']}|{b['available_copies']}"
-        for bid, b in book_db.items()
-    ]
-    write_records(BOOKS_FILE, rows)
-
-    return book_db[new_id]
+        return await repo.add_book(book.model_dump())
+
+@app.post("/bulk", response_model=dict, status_code=200, description="Add books from a CSV or NDJSON stream")
+async def bulk_add_books(request: Request, repo: Repository = Depends(get_repository)):
+    created, errors = 0, []
+    async for batch, batch_errors in read_batches(request, BookModel):
+        errors.extend(batch_errors)
+        async with repo.transaction():
+            books, seen = [], set()
+            for line_no, book in batch:
+                if repo.isbn_taken(book["isbn"]) or book["isbn"] in seen:
+                    errors.append({"line": line_no, "error": "Conflict"})
+                    continue
+                seen.add(book["isbn"])
+                books.append(book)
+            if books:
+                await repo.add_books(books)
+        created += len(books)
+
+    return {"created": created, "errors": sorted(errors, key=lambda error: error["line"])}
 
 @app.get("/{book_id}", response_model=BookModel, status_code=200, description="Get a book by ID")
-async def get_book_by_id(book_id: int = Path(..., description="The ID of the book to retrieve")):
-    if book_id not in book_db:
+async def get_book_by_id(book_id: int = Path(..., description="The ID of the book to retrieve"), repo: Repository = Depends(get_repository)):
+    if book_id not in repo.books:
         raise HTTPException(status_code=404, detail="Not Found")
-    return book_db[book_id]
+    return repo.books[book_id]
 
 @app.put("/{book_id}", response_model=BookModel, status_code=200, description="Update a book by ID")
-async def update_book(book: BookModel, book_id: int = Path(..., description="The ID of the book to update")):
-    if book_id not in book_db:
-        raise HTTPException(status_code=404, detail="Not Found")
-
-    stored = book_db[book_id]
-    stored["title"] = book.title or stored["title"]
-    stored["author"] = book.author or stored["author"]
-    stored["isbn"] = book.isbn or stored["isbn"]
-    stored["published_year"] = book.published_year or stored["published_year"]
-    stored["available_copies"] = book.available_copies or stored["available_copies"]
+async def update_book(book: BookModel, book_id: int = Path(..., description="The ID of the book to update"), repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        if book_id not in repo.books:
+            raise HTTPException(status_code=404, detail="Not Found")
 
-    rows = [
-        f"{bid}|{b['title']}|{b['author']}|{b['isbn']}|{b['published_year']}|{b['available_copies']}"
-        for bid, b in book_db.items()
-    ]
-    write_records(BOOKS_FILE, rows)
+        fields = {key: value for key, value in book.model_dump().items() if value}
+        if "isbn" in fields and repo.isbn_taken(fields["isbn"], book_id):
+            raise HTTPException(status_code=409, detail="Conflict")
 
-    return stored
+        return await repo.update_book(book_id, fields)
 
 @app.delete("/{book_id}", status_code=204, description="Delete a book by ID")
-async def delete_book(book_id: int = Path(..., description="The ID of the book to delete")):
-    if book_id not in book_db:
-        raise HTTPException(status_code=404, detail="Not Found")
-
-    del book_db[book_id]
+async def delete_book(book_id: int = Path(..., description="The ID of the book to delete"), repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        if book_id not in repo.books:
+            raise HTTPException(status_code=404, detail="Not Found")
 
-    rows = [
-        f"{bid}|{b['title']}|{b['author']}|{b['isbn']}|{b['published_year']}|{b['available_copies']}"
-        for bid, b in book_db.items()
-    ]
-    write_records(BOOKS_FILE, rows)
+        await repo.delete_book(book_id)
 
-    return None
\ No newline at end of file
+        return None
@@ -1,9 +1,7 @@
-from fastapi import FastAPI, HTTPException, Path
+from fastapi import FastAPI, HTTPException, Path, Query, Depends, Response
 from pydantic import BaseModel
-from datetime import datetime, timedelta
-from helpers.read_db import load_books, load_users, load_borrows
-from helpers.write_db import write_records
-from helpers.paths import BOOKS_FILE, BORROWS_FILE
+from .pagination import PageParams, paginate, project
+from .repository import Repository, get_repository
 
 app = FastAPI()
 
@@ -16,107 +14,110 @@ class BorrowReturnModel(BaseModel):
     return_date: str | None = None
     status: str | None = "borrowed"
 
-book_db = {book['id']: book for book in load_books()}
-user_db = {user['id']: user for user in load_users()}
-borrow_db = {borrow['borrow_id']: borrow for borrow in load_borrows()}
-
-def get_next_borrow_id():
-    return max(borrow_db.keys(), default=0) + 1
-
-def update_book_copies(book_id: int, change: int):
-    if book_id not in book_db:
-        return False
-    book_db[book_id]['available_copies'] += change
-    rows = [
-        f"{b['id']}|{b['title']}|{b['author']}|{b['isbn']}|{b['published_year']}|{b['available_copies']}"
-        for b in book_db.values()
-    ]
-    write_records(BOOKS_FILE, rows)
-    return True
-
-def persist_borrows():
-    rows = [
-        f"{b['borrow_id']}|{b['user_id']}|{b['book_id']}|{b['borrow_date']}|{b['due_date']}|{b['return_date'] or ''}|{b['status']}"
-        for b in borrow_db.values()
-    ]
-    write_records(BORROWS_FILE, rows)
+ERROR_DETAILS = {400: "Bad Request", 404: "Not Found", 409: "Conflict"}
+
+def check_borrow(repo: Repository, user_id: int, book_id: int) -> int:
+    if user_id not in repo.users or book_id not in repo.books:
+        return 404
+    if not repo.reserve_copy(book_id):
+        return 400
+    if repo.active_loan(user_id, book_id) is not None:
+        repo.release_copy(book_id)
+        return 409
+    return 201
+
+def batch_results(statuses: list[int], records: list):
+    records = iter(records)
+    results = []
+    for status in statuses:
+        if status < 400:
+            record = next(records)
+            results.append({"status": status, "record": None if record is None else dict(record)})
+        else:
+            results.append({"status": status, "detail": ERROR_DETAILS[status]})
+    return results
 
 @app.post("/", response_model=BorrowReturnModel, status_code=201, description="Borrow a book")
-async def borrow_book(record: BorrowReturnModel):
-    if record.user_id not in user_db:
-        raise HTTPException(status_code=404, detail="Not Found")
-    if record.book_id not in book_db:
-        raise HTTPException(status_code=404, detail="Not Found")
-    
-    book = book_db[record.book_id]
-    if book['available_copies'] <= 0:
-        raise HTTPException(status_code=400, detail="Bad Request")
-    
-    for b in borrow_db.values():
-        if b['user_id'] == record.user_id and b['book_id'] == record.book_id and b['status'] == "borrowed":
-            raise HTTPException(status_code=409, detail="Conflict")
-    
-    borrow_id = get_next_borrow_id()
-    borrow_date = datetime.now().strftime("%Y-%m-%d")
-    due_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-    
-    borrow_record = {
-        "borrow_id": borrow_id,
-        "user_id": record.user_id,
-        "book_id": record.book_id,
-        "borrow_date": borrow_date,
-        "due_date": due_date,
-        "return_date": None,
-        "status": "borrowed"
-    }
-    
-    borrow_db[borrow_id] = borrow_record
-    update_book_copies(record.book_id, -1)
-    persist_borrows()
-    
-    return BorrowReturnModel(**borrow_record)
+async def borrow_book(record: BorrowReturnModel, repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        status = check_borrow(repo, record.user_id, record.book_id)
+        if status != 201:
+            raise HTTPException(status_code=status, detail=ERROR_DETAILS[status])
+
+        return BorrowReturnModel(**await repo.borrow(record.user_id, record.book_id))
+
+@app.post("/batch", response_model=list[dict], status_code=200, description="Borrow several books in one request")
+async def borrow_books(records: list[BorrowReturnModel], atomic: bool = Query(False, description="Borrow nothing unless every item succeeds"), repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        statuses, loans = [], []
+        for record in records:
+            loan = (record.user_id, record.book_id)
+            status = 409 if loan in loans else check_borrow(repo, *loan)
+            if status == 201:
+                loans.append(loan)
+            statuses.append(status)
+
+        if atomic and len(loans) < len(records):
+            for _, book_id in loans:
+                repo.release_copy(book_id)
+            raise HTTPException(status_code=409, detail=batch_results(statuses, [None] * len(loans)))
+
+        return batch_results(statuses, await repo.borrow_many(loans))
 
 @app.post("/return", response_model=BorrowReturnModel, status_code=200, description="Return a book")
-async def return_book(record: BorrowReturnModel):
-    
-    for b in borrow_db.values():
-        if b['user_id'] == record.user_id and b['book_id'] == record.book_id and b['status'] == "borrowed":
-            b['status'] = "returned"
-            b['return_date'] = datetime.now().strftime("%Y-%m-%d")
-            update_book_copies(b['book_id'], 1)
-            persist_borrows()
-            return BorrowReturnModel(**b)
-    
-    raise HTTPException(status_code=404, detail="Not Found")
+async def return_book(record: BorrowReturnModel, repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        loan = repo.active_loan(record.user_id, record.book_id)
+        if loan is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+
+        return BorrowReturnModel(**await repo.return_borrow(loan['borrow_id']))
+
+@app.post("/return/batch", response_model=list[dict], status_code=200, description="Return several books in one request")
+async def return_books(records: list[BorrowReturnModel], atomic: bool = Query(False, description="Return nothing unless every item succeeds"), repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        statuses, borrow_ids = [], []
+        for record in records:
+            loan = repo.active_loan(record.user_id, record.book_id)
+            if loan is None or loan['borrow_id'] in borrow_ids:
+                statuses.append(404)
+            else:
+                statuses.append(200)
+                borrow_ids.append(loan['borrow_id'])
 
-@app.get("/", response_model=list[BorrowReturnModel], status_code=200, description="List all borrow records")
-async def list_borrows():
-    return [BorrowReturnModel(**b) for b in borrow_db.values()]
+        if atomic and len(borrow_ids) < len(records):
+            raise HTTPException(status_code=409, detail=batch_results(statuses, [None] * len(borrow_ids)))
+
+        return batch_results(statuses, await repo.return_many(borrow_ids))
+
+@app.get("/", response_model=list[dict], status_code=200, description="List all borrow records")
+async def list_borrows(response: Response, page: PageParams = Depends(), repo: Repository = Depends(get_repository)):
+    return [project(repo.borrows[borrow_id], page.fields) for borrow_id in paginate(repo.borrow_ids, page, response)]
 
 @app.get("/user/{user_id}", response_model=list[BorrowReturnModel], status_code=200, description="List borrow records by user")
-async def borrows_by_user(user_id: int = Path(..., ge=1)):
-    return [BorrowReturnModel(**b) for b in borrow_db.values() if b['user_id'] == user_id]
+async def borrows_by_user(user_id: int = Path(..., ge=1), repo: Repository = Depends(get_repository)):
+    return [BorrowReturnModel(**b) for b in repo.user_borrows(user_id)]
 
 @app.get("/book/{book_id}", response_model=list[BorrowReturnModel], status_code=200, description="List borrow records by book")
-async def borrows_by_book(book_id: int = Path(..., ge=1)):
-    return [BorrowReturnModel(**b) for b in borrow_db.values() if b['book_id'] == book_id]
+async def borrows_by_book(book_id: int = Path(..., ge=1), repo: Repository = Depends(get_repository)):
+    return [BorrowReturnModel(**b) for b in repo.book_borrows(book_id)]
 
 @app.get("/user/{user_id}/book/{book_id}", response_model=BorrowReturnModel, status_code=200, description="Get borrow record by user and book")
-async def get_borrow_record(user_id: int = Path(..., ge=1), book_id: int = Path(..., ge=1)):
-    for b in borrow_db.values():
-        if b['user_id'] == user_id and b['book_id'] == book_id:
+async def get_borrow_record(user_id: int = Path(..., ge=1), book_id: int = Path(..., ge=1), repo: Repository = Depends(get_repository)):
+    for b in repo.user_borrows(user_id):
+        if b['book_id'] == book_id:
             return BorrowReturnModel(**b)
     raise HTTPException(status_code=404, detail="Not Found")
 
 @app.get("/check-availability/{book_id}", status_code=200, description="Check if a book is available")
-async def check_book_availability(book_id: int = Path(..., ge=1)):
-    if book_id not in book_db:
+async def check_book_availability(book_id: int = Path(..., ge=1), repo: Repository = Depends(get_repository)):
+    if book_id not in repo.books:
         raise HTTPException(status_code=404, detail="Not Found")
-    
-    book = book_db[book_id]
+
+    book = repo.books[book_id]
     return {
         "book_id": book_id,
         "title": book["title"],
         "available_copies": book["available_copies"],
         "is_available": book["available_copies"] > 0
-    }
\ No newline at end of file
+    }
@@ -1,8 +1,8 @@
-from fastapi import FastAPI, Query, Path, HTTPException
+from fastapi import FastAPI, Query, Path, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
-from helpers.paths import USERS_FILE
-from helpers.read_db import load_users
-from helpers.write_db import write_records
+from .bulk import read_batches
+from .pagination import PageParams, paginate, project
+from .repository import Repository, get_repository
 
 app = FastAPI()
 
@@ -11,62 +11,70 @@ class UserModel(BaseModel):
     full_name: str | None = None
     email: str | None = None
 
-def load_user_db():
-    users = load_users()
-    return {user['id']: user for user in users}
-
-user_db = load_user_db()
-
 @app.get("/", response_model=dict, status_code=200, description="Get all users")
-async def get_all_users():
-    return user_db
+async def get_all_users(response: Response, page: PageParams = Depends(), repo: Repository = Depends(get_repository)):
+    return {user_id: project(repo.users[user_id], page.fields) for user_id in paginate(repo.user_ids, page, response)}
 
 @app.post("/", response_model=UserModel, status_code=201, description="Add a new user")
-async def add_user(user: UserModel):
-    if not all([user.username, user.full_name, user.email]):
-        raise HTTPException(status_code=400, detail="Bad Request")
+async def add_user(user: UserModel, repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        if not all([user.username, user.full_name, user.email]):
+            raise HTTPException(status_code=400, detail="Bad Request")
 
-    for existing in user_db.values():
-        if existing.get("username") == user.username:
+        if repo.username_taken(user.username) or repo.email_taken(user.email):
             raise HTTPException(status_code=409, detail="Conflict")
 
-    new_id = max(user_db.keys()) + 1 if user_db else 1
-    user_db[new_id] = user.model_dump()
-
-    rows = [f"{uid}|{u['username']}|{u['full_name']}|{u['email']}" for uid, u in user_db.items()]
-    write_records(USERS_FILE, rows)
-
-    return user_db[new_id]
+        return await repo.add_user(user.model_dump())
+
+@app.post("/bulk", response_model=dict, status_code=200, description="Add users from a CSV or NDJSON stream")
+async def bulk_add_users(request: Request, repo: Repository = Depends(get_repository)):
+    created, errors = 0, []
+    async for batch, batch_errors in read_batches(request, UserModel):
+        errors.extend(batch_errors)
+        async with repo.transaction():
+            users, usernames, emails = [], set(), set()
+            for line_no, user in batch:
+                if not all([user["username"], user["full_name"], user["email"]]):
+                    errors.append({"line": line_no, "error": "Bad Request"})
+                    continue
+                if repo.username_taken(user["username"]) or repo.email_taken(user["email"]) or user["username"] in usernames or user["email"] in emails:
+                    errors.append({"line": line_no, "error": "Conflict"})
+                    continue
+                usernames.add(user["username"])
+                emails.add(user["email"])
+                users.append(user)
+            if users:
+                await repo.add_users(users)
+        created += len(users)
+
+    return {"created": created, "errors": sorted(errors, key=lambda error: error["line"])}
 
 @app.get("/{user_id}", response_model=UserModel, status_code=200, description="Get a user by ID")
-async def get_user_by_id(user_id: int = Path(..., description="The ID of the user to retrieve")):
-    if user_id not in user_db:
+async def get_user_by_id(user_id: int = Path(..., description="The ID of the user to retrieve"), repo: Repository = Depends(get_repository)):
+    if user_id not in repo.users:
         raise HTTPException(status_code=404, detail="Not Found")
-    return user_db[user_id]
+    return repo.users[user_id]
 
 @app.put("/{user_id}", response_model=UserModel, status_code=200, description="Update a user by ID")
-async def update_user(user_id: int, user: UserModel):
-    if user_id not in user_db:
-        raise HTTPException(status_code=404, detail="Not Found")
+async def update_user(user_id: int, user: UserModel, repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        if user_id not in repo.users:
+            raise HTTPException(status_code=404, detail="Not Found")
 
-    stored = user_db[user_id]
-    stored["username"] = user.username or stored["username"]
-    stored["full_name"] = user.full_name or stored["full_name"]
-    stored["email"] = user.email or stored["email"]
-
-    rows = [f"{uid}|{u['username']}|{u['full_name']}|{u['email']}" for uid, u in user_db.items()]
-    write_records(USERS_FILE, rows)
+        fields = {key: value for key, value in user.model_dump().items() if value}
+        if "username" in fields and repo.username_taken(fields["username"], user_id):
+            raise HTTPException(status_code=409, detail="Conflict")
+        if "email" in fields and repo.email_taken(fields["email"], user_id):
+            raise HTTPException(status_code=409, detail="Conflict")
 
-    return stored
+        return await repo.update_user(user_id, fields)
 
 @app.delete("/{user_id}", status_code=204, description="Delete a user by ID")
-async def delete_user(user_id: int):
-    if user_id not in user_db:
-        raise HTTPException(status_code=404, detail="Not Found")
-
-    del user_db[user_id]
+async def delete_user(user_id: int, repo: Repository = Depends(get_repository)):
+    async with repo.transaction():
+        if user_id not in repo.users:
+            raise HTTPException(status_code=404, detail="Not Found")
 
-    rows = [f"{uid}|{u['username']}|{u['full_name']}|{u['email']}" for uid, u in user_db.items()]
-    write_records(USERS_FILE, rows)
+        await repo.delete_user(user_id)
 
-    return None
\ No newline at end of file
+        return None
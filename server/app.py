@@ -1,15 +1,28 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from .repository import Repository
 from .api_book_management import app as book_management 
 from .api_user_management import app as user_management 
 from .api_borrow_return import app as borrow_return 
 from .api_admin import app as admin 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await repository.start()
+    yield
+    await repository.stop()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Library Management System",
     description="A comprehensive API service for Library Management System with Book Management, User Management, Borrow & Return System and Reports features.",
     version="2.1.0",
 )
 
+repository = Repository()
+for sub_app in (book_management, user_management, borrow_return, admin):
+    sub_app.state.repository = repository
+
 app.mount("/book", book_management)
 app.mount("/user", user_management)
 app.mount("/borrow", borrow_return)
@@ -0,0 +1,54 @@
+import codecs
+import csv
+import json
+from fastapi import Request
+from pydantic import BaseModel, ValidationError
+
+BULK_BATCH_SIZE = 1000
+
+async def read_lines(request: Request):
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield line_no + 1, buffer.rstrip("\r")
+
+def csv_parser():
+    header = []
+
+    def parse(line: str):
+        values = next(csv.reader([line]))
+        if not header:
+            header.extend(value.strip() for value in values)
+            return None
+        return {key: value or None for key, value in zip(header, values)}
+
+    return parse
+
+async def read_batches(request: Request, model: type[BaseModel]):
+    parse = csv_parser() if "csv" in request.headers.get("content-type", "") else json.loads
+    batch, errors = [], []
+    async for line_no, line in read_lines(request):
+        if not line.strip():
+            continue
+        try:
+            record = parse(line)
+            if record is None:
+                continue
+            batch.append((line_no, model.model_validate(record).model_dump()))
+        except (ValueError, ValidationError) as e:
+            errors.append({"line": line_no, "error": str(e)})
+
+        if len(batch) == BULK_BATCH_SIZE:
+            yield batch, errors
+            batch, errors = [], []
+
+    if batch or errors:
+        yield batch, errors
@@ -0,0 +1,71 @@
+from helpers.records import Borrow
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class BorrowColumns:
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.next_seq = 0
+        self.book_id = np.zeros(capacity, np.int64)
+        self.borrow_day = np.zeros(capacity, np.int64)
+        self.seq = np.zeros(capacity, np.int64)
+        self.filled = np.zeros(capacity, np.bool_)
+
+    @classmethod
+    def build(cls, borrows):
+        borrows = list(borrows)
+        count = len(borrows)
+        ids = np.fromiter((borrow.borrow_id for borrow in borrows), np.int64, count)
+        columns = cls(max(1024, int(ids.max(initial=0)) + 1))
+        columns.book_id[ids] = np.fromiter((borrow.book_id for borrow in borrows), np.int64, count)
+        columns.borrow_day[ids] = np.fromiter((borrow.borrow_day for borrow in borrows), np.int64, count)
+        columns.seq[ids] = np.arange(count)
+        columns.filled[ids] = True
+        columns.size = int(ids.max(initial=-1)) + 1
+        columns.next_seq = count
+        return columns
+
+    def _reserve(self, borrow_id: int):
+        capacity = len(self.filled)
+        if borrow_id < capacity:
+            return
+        while capacity <= borrow_id:
+            capacity *= 2
+        for name in ("book_id", "borrow_day", "seq"):
+            column = np.zeros(capacity, np.int64)
+            column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+        filled = np.zeros(capacity, np.bool_)
+        filled[:self.size] = self.filled[:self.size]
+        self.filled = filled
+
+    def add(self, borrow: Borrow):
+        row = borrow.borrow_id
+        self._reserve(row)
+        self.book_id[row] = borrow.book_id
+        self.borrow_day[row] = borrow.borrow_day
+        self.seq[row] = self.next_seq
+        self.filled[row] = True
+        self.next_seq += 1
+        self.size = max(self.size, row + 1)
+
+    def top_window(self, k: int, days: int, today: int):
+        day = self.borrow_day[:self.size]
+        mask = self.filled[:self.size] & (day > today - days) & (day <= today)
+        if not mask.any():
+            return []
+
+        books = self.book_id[:self.size][mask]
+        counts = np.bincount(books)
+
+        # Match BorrowLeaderboard.top_window: ties keep the order in which
+        # books first appear when walking the window day by day.
+        first = np.full(len(counts), np.iinfo(np.int64).max)
+        np.minimum.at(first, books, day[mask] * self.next_seq + self.seq[:self.size][mask])
+
+        candidates = np.flatnonzero(counts)
+        ranked = candidates[np.lexsort((first[candidates], -counts[candidates]))][:k]
+        return [(int(book_id), int(counts[book_id])) for book_id in ranked]
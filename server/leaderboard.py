@@ -0,0 +1,56 @@
+import heapq
+from bisect import bisect_left, insort
+
+MAX_WINDOW_DAYS = 365
+
+class BorrowLeaderboard:
+    def __init__(self):
+        self.counts = {}
+        self.first_seen = {}
+        self.buckets = {}
+        self.levels = []
+        self.daily = {}
+        self.latest_day = 0
+
+    def record(self, book_id: int, day: int):
+        # Buckets stay sorted by first appearance so ties rank the same way
+        # as a stable sort over the borrow history.
+        entry = (self.first_seen.setdefault(book_id, len(self.first_seen)), book_id)
+        count = self.counts.get(book_id, 0)
+        if count:
+            bucket = self.buckets[count]
+            del bucket[bisect_left(bucket, entry)]
+            if not bucket:
+                del self.buckets[count]
+                del self.levels[bisect_left(self.levels, count)]
+
+        count += 1
+        self.counts[book_id] = count
+        if count not in self.buckets:
+            self.buckets[count] = []
+            insort(self.levels, count)
+        insort(self.buckets[count], entry)
+
+        if day > self.latest_day:
+            self.latest_day = day
+            for old_day in [d for d in self.daily if d <= day - MAX_WINDOW_DAYS]:
+                del self.daily[old_day]
+        if day > self.latest_day - MAX_WINDOW_DAYS:
+            day_counts = self.daily.setdefault(day, {})
+            day_counts[book_id] = day_counts.get(book_id, 0) + 1
+
+    def top(self, k: int):
+        result = []
+        for count in reversed(self.levels):
+            for _, book_id in self.buckets[count]:
+                result.append((book_id, count))
+                if len(result) == k:
+                    return result
+        return result
+
+    def top_window(self, k: int, days: int, today: int):
+        totals = {}
+        for day in range(today - days + 1, today + 1):
+            for book_id, count in self.daily.get(day, {}).items():
+                totals[book_id] = totals.get(book_id, 0) + count
+        return heapq.nlargest(k, totals.items(), key=lambda item: item[1])
@@ -0,0 +1,26 @@
+from bisect import bisect_right
+from fastapi import Query, Response
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=1000, description="Maximum number of records to return"),
+        cursor: int | None = Query(None, ge=0, description="Return records with an id greater than this value"),
+        fields: str | None = Query(None, description="Comma-separated list of fields to include"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+
+def paginate(ids: list[int], page: PageParams, response: Response):
+    start = 0 if page.cursor is None else bisect_right(ids, page.cursor)
+    end = len(ids) if page.limit is None else start + page.limit
+    page_ids = ids[start:end]
+    if end < len(ids):
+        response.headers["X-Next-Cursor"] = str(page_ids[-1])
+    return page_ids
+
+def project(record: dict, fields: list[str] | None):
+    if fields is None:
+        return dict(record)
+    return {field: record[field] for field in fields if field in record}
@@ -0,0 +1,27 @@
+REPORT_CACHE_SIZE = 256
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+class ReportCache:
+    def __init__(self, size: int = REPORT_CACHE_SIZE):
+        self.size = size
+        self.version = None
+        self.entries = {}
+
+    def get(self, version: str, key: tuple, compute):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+        if key not in self.entries:
+            if len(self.entries) >= self.size:
+                del self.entries[next(iter(self.entries))]
+            self.entries[key] = compute()
+        return self.entries[key]
+
+class CapturedHeaders:
+    def __init__(self):
+        self.headers = {}
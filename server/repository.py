@@ -0,0 +1,366 @@
+import asyncio
+import uuid
+from bisect import bisect_left, insort
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from fastapi import Request
+from helpers.config import WRITE_BATCH_WINDOW_MS, WRITE_BATCH_SIZE
+from helpers.records import Borrow, BorrowStatus
+from helpers.storage import Storage, open_storage
+from helpers.writer import AsyncWriter
+from .columns import BorrowColumns, np
+from .leaderboard import BorrowLeaderboard
+from .search import SearchIndex
+
+class Repository:
+    def __init__(self, storage: Storage | None = None):
+        self.storage = storage or open_storage()
+        # Shared storage writes under the cross-process lock, so no other
+        # request can join a batch; waiting for one would only hold the lock.
+        window = 0.0 if self.storage.shared else WRITE_BATCH_WINDOW_MS / 1000
+        self.writer = AsyncWriter(self._prepare, self.storage.apply, window, WRITE_BATCH_SIZE, self._rollback)
+        self._transaction_lock = asyncio.Lock()
+        self._poll_lock = asyncio.Lock()
+        self.instance_id = uuid.uuid4().hex[:8]
+        self.version = 0
+        self._load()
+
+    def _load(self):
+        self.books = {book["id"]: book for book in self.storage.load_books()}
+        self.users = {user["id"]: user for user in self.storage.load_users()}
+        self.borrows = {borrow.borrow_id: borrow for borrow in self.storage.load_borrows()}
+        self.tables = {"books": self.books, "users": self.users, "borrows": self.borrows}
+        self.book_ids = sorted(self.books)
+        self.user_ids = sorted(self.users)
+        self.borrow_ids = sorted(self.borrows)
+
+        self.summary = {
+            "total_books": 0,
+            "total_users": 0,
+            "total_borrows": 0,
+            "active_borrows": 0,
+            "returned_borrows": 0,
+            "total_copies_available": 0
+        }
+
+        self.isbn_index = {}
+        self.book_search = SearchIndex({"title": 3, "author": 2, "isbn": 1})
+        self.username_index = {}
+        self.email_index = {}
+        for book in self.books.values():
+            self._index_book(book)
+        for user in self.users.values():
+            self._index_user(user)
+
+        self.borrows_by_user = {}
+        self.borrows_by_book = {}
+        self.active_loans = {}
+        self.due_index = []
+        self.leaderboard = BorrowLeaderboard()
+        self.borrow_columns = None
+        for borrow in self.borrows.values():
+            self._index_borrow(borrow)
+        if np is not None:
+            self.borrow_columns = BorrowColumns.build(self.borrows.values())
+        self.version += 1
+        self.next_borrow_id = max(self.borrows, default=0) + 1
+
+    def _index_book(self, book: dict):
+        self.isbn_index[book["isbn"]] = book["id"]
+        self.book_search.add(book["id"], book)
+        self.summary["total_books"] += 1
+        self.summary["total_copies_available"] += book["available_copies"] or 0
+
+    def _unindex_book(self, book: dict):
+        if self.isbn_index.get(book["isbn"]) == book["id"]:
+            del self.isbn_index[book["isbn"]]
+        self.book_search.remove(book["id"])
+        self.summary["total_books"] -= 1
+        self.summary["total_copies_available"] -= book["available_copies"] or 0
+
+    def _index_user(self, user: dict):
+        self.username_index[user["username"]] = user["id"]
+        self.email_index[user["email"]] = user["id"]
+        self.summary["total_users"] += 1
+
+    def _unindex_user(self, user: dict):
+        if self.username_index.get(user["username"]) == user["id"]:
+            del self.username_index[user["username"]]
+        if self.email_index.get(user["email"]) == user["id"]:
+            del self.email_index[user["email"]]
+        self.summary["total_users"] -= 1
+
+    def isbn_taken(self, isbn: str, book_id: int | None = None):
+        return self.isbn_index.get(isbn, book_id) != book_id
+
+    def username_taken(self, username: str, user_id: int | None = None):
+        return self.username_index.get(username, user_id) != user_id
+
+    def email_taken(self, email: str, user_id: int | None = None):
+        return self.email_index.get(email, user_id) != user_id
+
+    def _index_borrow(self, borrow: Borrow):
+        self.borrows_by_user.setdefault(borrow.user_id, []).append(borrow.borrow_id)
+        self.borrows_by_book.setdefault(borrow.book_id, []).append(borrow.borrow_id)
+        self.leaderboard.record(borrow.book_id, borrow.borrow_day)
+        if self.borrow_columns is not None:
+            self.borrow_columns.add(borrow)
+        self.summary["total_borrows"] += 1
+        if borrow.status is BorrowStatus.BORROWED:
+            self.active_loans[(borrow.user_id, borrow.book_id)] = borrow.borrow_id
+            insort(self.due_index, (borrow.due_day, borrow.borrow_id))
+            self.summary["active_borrows"] += 1
+        else:
+            self.summary["returned_borrows"] += 1
+
+    def _close_loan(self, borrow: Borrow):
+        self.active_loans.pop((borrow.user_id, borrow.book_id), None)
+        del self.due_index[bisect_left(self.due_index, (borrow.due_day, borrow.borrow_id))]
+        self.summary["active_borrows"] -= 1
+        self.summary["returned_borrows"] += 1
+
+    def _replace(self, table: dict, ids: list, index, unindex, key: int, record: dict | None):
+        if key in table:
+            unindex(table[key])
+            if record is None:
+                del table[key]
+                del ids[bisect_left(ids, key)]
+                return
+            table[key].update(record)
+        elif record is None:
+            return
+        else:
+            table[key] = record
+            insort(ids, key)
+        index(table[key])
+
+    def _replace_borrow(self, borrow_id: int, borrow: Borrow | None):
+        existing = self.borrows.get(borrow_id)
+        if borrow is None:
+            return
+        if existing is None:
+            self.borrows[borrow_id] = borrow
+            insort(self.borrow_ids, borrow_id)
+            self._index_borrow(borrow)
+            self.next_borrow_id = max(self.next_borrow_id, borrow_id + 1)
+            return
+        if existing.status is BorrowStatus.BORROWED and borrow.status is BorrowStatus.RETURNED:
+            self._close_loan(existing)
+        existing.update(borrow)
+
+    def _apply_remote_changes(self, changes: list[tuple[str, int, dict | None]] | None):
+        if changes is None:
+            self._load()
+            return
+        if changes:
+            self.version += 1
+
+        for entity, key, record in changes:
+            if entity == "books":
+                self._replace(self.books, self.book_ids, self._index_book, self._unindex_book, key, record)
+            elif entity == "users":
+                self._replace(self.users, self.user_ids, self._index_user, self._unindex_user, key, record)
+            else:
+                self._replace_borrow(key, record)
+
+    async def _poll(self):
+        # Polls are applied one at a time and in order, so an older poll can
+        # never overwrite rows fetched by a newer one.
+        async with self._poll_lock:
+            self._apply_remote_changes(await asyncio.to_thread(self.storage.poll_changes))
+
+    async def sync(self):
+        if self.storage.shared and not self._transaction_lock.locked() and not self._poll_lock.locked():
+            await self._poll()
+
+    @asynccontextmanager
+    async def transaction(self):
+        if not self.storage.shared:
+            yield
+            return
+
+        async with self._transaction_lock:
+            await asyncio.to_thread(self.storage.acquire_lock)
+            try:
+                await self._poll()
+                yield
+            finally:
+                self.storage.release_lock()
+
+    def data_version(self) -> str | None:
+        if not self.storage.shared:
+            return f"{self.instance_id}.{self.version}"
+        if self._transaction_lock.locked():
+            return None
+        return str(self.storage.last_seq)
+
+    def compute_summary(self):
+        # Counted from the records themselves: the NumPy columns are updated
+        # alongside the counters, so they cannot check them.
+        statuses = {status: 0 for status in BorrowStatus}
+        for borrow in self.borrows.values():
+            statuses[borrow.status] += 1
+
+        return {
+            "total_books": len(self.books),
+            "total_users": len(self.users),
+            "total_borrows": len(self.borrows),
+            "active_borrows": statuses[BorrowStatus.BORROWED],
+            "returned_borrows": statuses[BorrowStatus.RETURNED],
+            "total_copies_available": sum(book["available_copies"] or 0 for book in self.books.values())
+        }
+
+    def overdue_loans(self, today: int, offset: int = 0, limit: int | None = None):
+        end = bisect_left(self.due_index, (today,))
+        stop = end if limit is None else min(end, offset + limit)
+        return end, [(due, self.borrows[borrow_id]) for due, borrow_id in self.due_index[offset:stop]]
+
+    def user_borrows(self, user_id: int):
+        return [self.borrows[borrow_id] for borrow_id in self.borrows_by_user.get(user_id, [])]
+
+    def book_borrows(self, book_id: int):
+        return [self.borrows[borrow_id] for borrow_id in self.borrows_by_book.get(book_id, [])]
+
+    def active_loan(self, user_id: int, book_id: int):
+        borrow_id = self.active_loans.get((user_id, book_id))
+        return None if borrow_id is None else self.borrows[borrow_id]
+
+    async def start(self):
+        self.storage.start()
+        await self.writer.start()
+
+    async def stop(self):
+        await self.writer.stop()
+        self.storage.stop(self.tables)
+
+    def _prepare(self, changes: list[tuple[str, int]]):
+        return self.storage.prepare(changes, self.tables)
+
+    def _rollback(self):
+        # A failed write leaves its in-memory changes (and those of every
+        # write queued behind it) unpersisted; reload the last durable state.
+        self.storage.reset()
+        self._load()
+
+    async def _save(self, *changes: tuple[str, int]):
+        self.version += 1
+        await self.writer.submit(list(changes))
+
+    async def add_book(self, data: dict):
+        book_id = (self.book_ids[-1] if self.book_ids else 0) + 1
+        self.books[book_id] = {"id": book_id, **data}
+        self.book_ids.append(book_id)
+        self._index_book(self.books[book_id])
+        await self._save(("books", book_id))
+        return self.books[book_id]
+
+    async def add_books(self, records: list[dict]):
+        book_id = self.book_ids[-1] if self.book_ids else 0
+        changes = []
+        for data in records:
+            book_id += 1
+            self.books[book_id] = {"id": book_id, **data}
+            self.book_ids.append(book_id)
+            self._index_book(self.books[book_id])
+            changes.append(("books", book_id))
+        await self._save(*changes)
+
+    async def update_book(self, book_id: int, fields: dict):
+        self._unindex_book(self.books[book_id])
+        self.books[book_id].update(fields)
+        self._index_book(self.books[book_id])
+        await self._save(("books", book_id))
+        return self.books[book_id]
+
+    async def delete_book(self, book_id: int):
+        self._unindex_book(self.books.pop(book_id))
+        del self.book_ids[bisect_left(self.book_ids, book_id)]
+        await self._save(("books", book_id))
+
+    async def add_user(self, data: dict):
+        user_id = (self.user_ids[-1] if self.user_ids else 0) + 1
+        self.users[user_id] = {"id": user_id, **data}
+        self.user_ids.append(user_id)
+        self._index_user(self.users[user_id])
+        await self._save(("users", user_id))
+        return self.users[user_id]
+
+    async def add_users(self, records: list[dict]):
+        user_id = self.user_ids[-1] if self.user_ids else 0
+        changes = []
+        for data in records:
+            user_id += 1
+            self.users[user_id] = {"id": user_id, **data}
+            self.user_ids.append(user_id)
+            self._index_user(self.users[user_id])
+            changes.append(("users", user_id))
+        await self._save(*changes)
+
+    async def update_user(self, user_id: int, fields: dict):
+        self._unindex_user(self.users[user_id])
+        self.users[user_id].update(fields)
+        self._index_user(self.users[user_id])
+        await self._save(("users", user_id))
+        return self.users[user_id]
+
+    async def delete_user(self, user_id: int):
+        self._unindex_user(self.users.pop(user_id))
+        del self.user_ids[bisect_left(self.user_ids, user_id)]
+        await self._save(("users", user_id))
+
+    def reserve_copy(self, book_id: int) -> bool:
+        book = self.books.get(book_id)
+        if book is None or book["available_copies"] <= 0:
+            return False
+        book["available_copies"] -= 1
+        self.summary["total_copies_available"] -= 1
+        return True
+
+    def release_copy(self, book_id: int):
+        if book_id in self.books:
+            self.books[book_id]["available_copies"] += 1
+            self.summary["total_copies_available"] += 1
+
+    def _new_borrow(self, user_id: int, book_id: int):
+        borrow_id = self.next_borrow_id
+        self.next_borrow_id += 1
+        now = datetime.now()
+        self.borrows[borrow_id] = Borrow(borrow_id, user_id, book_id, now.strftime("%Y-%m-%d"), (now + timedelta(days=7)).strftime("%Y-%m-%d"))
+        self.borrow_ids.append(borrow_id)
+        self._index_borrow(self.borrows[borrow_id])
+        return self.borrows[borrow_id]
+
+    async def borrow(self, user_id: int, book_id: int):
+        return (await self.borrow_many([(user_id, book_id)]))[0]
+
+    async def borrow_many(self, loans: list[tuple[int, int]]):
+        borrows, changes = [], []
+        for user_id, book_id in loans:
+            borrow = self._new_borrow(user_id, book_id)
+            borrows.append(borrow)
+            changes += [("books", book_id), ("borrows", borrow["borrow_id"])]
+        if changes:
+            await self._save(*changes)
+        return borrows
+
+    async def return_borrow(self, borrow_id: int):
+        return (await self.return_many([borrow_id]))[0]
+
+    async def return_many(self, borrow_ids: list[int]):
+        borrows, changes = [], []
+        for borrow_id in borrow_ids:
+            borrow = self.borrows[borrow_id]
+            borrow.status = BorrowStatus.RETURNED
+            borrow["return_date"] = datetime.now().strftime("%Y-%m-%d")
+            self._close_loan(borrow)
+            self.release_copy(borrow["book_id"])
+            borrows.append(borrow)
+            changes += [("books", borrow["book_id"]), ("borrows", borrow_id)]
+        if changes:
+            await self._save(*changes)
+        return borrows
+
+async def get_repository(request: Request) -> Repository:
+    repository = request.app.state.repository
+    await repository.sync()
+    return repository
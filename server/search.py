@@ -0,0 +1,71 @@
+import heapq
+import re
+import unicodedata
+
+ISBN_QUERY = re.compile(r"[0-9Xx][0-9Xx\s-]*")
+
+def tokenize(text) -> list[str]:
+    text = unicodedata.normalize("NFKD", str(text)).casefold()
+    chars = []
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        chars.append(char if char.isalnum() or unicodedata.category(char).startswith("M") else " ")
+    return "".join(chars).split()
+
+class SearchIndex:
+    def __init__(self, fields: dict[str, int]):
+        self.fields = fields
+        self.postings = {}
+        self.documents = {}
+
+    def _terms(self, record: dict):
+        terms = {}
+        for field, weight in self.fields.items():
+            value = record.get(field)
+            if value is None:
+                continue
+            tokens = tokenize(value)
+            if field == "isbn":
+                tokens = ["".join(tokens)]
+            for token in tokens:
+                terms[token] = terms.get(token, 0) + weight
+        return terms
+
+    def add(self, doc_id: int, record: dict):
+        terms = self._terms(record)
+        self.documents[doc_id] = terms
+        for token, weight in terms.items():
+            self.postings.setdefault(token, {})[doc_id] = weight
+
+    def remove(self, doc_id: int):
+        for token in self.documents.pop(doc_id, {}):
+            posting = self.postings[token]
+            del posting[doc_id]
+            if not posting:
+                del self.postings[token]
+
+    def search(self, query: str, limit: int = 20, offset: int = 0):
+        tokens = set(tokenize(query))
+        if not tokens:
+            return 0, []
+
+        # ISBNs are indexed as one joined token, so "978-984-701-2345" has to
+        # be looked up the same way rather than as four separate numbers.
+        if ISBN_QUERY.fullmatch(query.strip()):
+            isbn = "".join(tokenize(query))
+            if isbn in self.postings:
+                tokens = {isbn}
+
+        postings = sorted((self.postings.get(token, {}) for token in tokens), key=len)
+        if not postings[0]:
+            return 0, []
+
+        scores = dict(postings[0])
+        for posting in postings[1:]:
+            scores = {doc_id: score + posting[doc_id] for doc_id, score in scores.items() if doc_id in posting}
+            if not scores:
+                return 0, []
+
+        ranked = heapq.nsmallest(offset + limit, scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        return len(scores), ranked[offset:]
@@ -0,0 +1,20 @@
+import os
+import shutil
+import pytest
+from helpers import paths, read_db, write_db
+from helpers.storage import TextStorage
+
+@pytest.fixture
+def database_dir(tmp_path, monkeypatch):
+    """A copy of the shipped text database that the helpers read and write instead of database/."""
+    for name in ("books.txt", "users.txt", "borrows.txt"):
+        shutil.copy(os.path.join(paths.DATABASE_DIR, name), tmp_path / name)
+
+    files = {entity: (str(tmp_path / os.path.basename(path)), formatter) for entity, (path, formatter) in TextStorage.files.items()}
+    monkeypatch.setattr(TextStorage, "files", files)
+    monkeypatch.setattr(read_db, "BOOKS_FILE", files["books"][0])
+    monkeypatch.setattr(read_db, "USERS_FILE", files["users"][0])
+    monkeypatch.setattr(read_db, "BORROWS_FILE", files["borrows"][0])
+    monkeypatch.setattr(write_db, "DATABASE_DIR", str(tmp_path))
+    monkeypatch.setattr(write_db, "JOURNAL_FILE", str(tmp_path / "transaction.journal"))
+    return tmp_path
@@ -0,0 +1,54 @@
+import asyncio
+from fastapi import HTTPException
+from helpers.sqlite_db import SQLiteStorage
+from server.api_borrow_return import BorrowReturnModel, borrow_book
+from server.repository import Repository
+
+BORROWERS = 3000
+
+def open_library(path: str, shared: bool = False):
+    storage = SQLiteStorage(path, shared=shared)
+    storage.import_records("books", [{"id": 1, "title": "Deyal", "author": "Humayun Ahmed", "isbn": "9789847012345", "published_year": 2012, "available_copies": 1}])
+    storage.import_records("users", [{"id": user_id, "username": f"user{user_id}", "full_name": f"User {user_id}", "email": f"user{user_id}@example.com"} for user_id in range(1, BORROWERS + 1)])
+    return storage
+
+async def attempt(repo: Repository, user_id: int):
+    try:
+        await borrow_book(BorrowReturnModel(user_id=user_id, book_id=1), repo)
+        return 201
+    except HTTPException as e:
+        return e.status_code
+
+async def borrow_last_copy(repos: list[Repository]):
+    for repo in repos:
+        await repo.start()
+    try:
+        return await asyncio.gather(*(attempt(repos[user_id % len(repos)], user_id) for user_id in range(1, BORROWERS + 1)))
+    finally:
+        for repo in repos:
+            await repo.stop()
+
+def test_concurrent_borrows_of_last_copy(tmp_path):
+    repo = Repository(open_library(str(tmp_path / "library.db")))
+    statuses = asyncio.run(borrow_last_copy([repo]))
+
+    assert statuses.count(201) == 1
+    assert statuses.count(400) == BORROWERS - 1
+    assert repo.books[1]["available_copies"] == 0
+    assert len(repo.borrows) == 1
+
+def test_concurrent_borrows_of_last_copy_across_workers(tmp_path):
+    path = str(tmp_path / "library.db")
+    open_library(path).stop()
+    repos = [Repository(SQLiteStorage(path, shared=True)) for _ in range(2)]
+    statuses = asyncio.run(borrow_last_copy(repos))
+
+    assert statuses.count(201) == 1
+    assert statuses.count(400) == BORROWERS - 1
+
+    storage = SQLiteStorage(path)
+    try:
+        assert [book["available_copies"] for book in storage.load_books()] == [0]
+        assert len(storage.load_borrows()) == 1
+    finally:
+        storage.stop()
@@ -0,0 +1,55 @@
+from helpers import read_db, write_db
+
+BOOK_1 = "1|A Golden Age|Tahmima Anam|9789848823456|2007|5"
+
+def book_ids():
+    return [book["id"] for book in read_db.load_books()]
+
+def test_torn_log_tail_is_truncated(database_dir):
+    # "-|15" torn after one byte of its key would otherwise delete book 1.
+    (database_dir / "books.log").write_text("+|2|Amar Ache Jol|Humayun Ahmed|9789847012345|1997|3\n-|1", encoding="utf-8")
+    write_db.recover_pending_writes()
+
+    assert (database_dir / "books.log").read_text(encoding="utf-8") == "+|2|Amar Ache Jol|Humayun Ahmed|9789847012345|1997|3\n"
+    assert 1 in book_ids()
+    assert read_db.load_books()[1]["available_copies"] == 3
+
+def test_torn_update_does_not_overwrite_record(database_dir):
+    (database_dir / "books.log").write_text("+|1|A Gol", encoding="utf-8")
+    write_db.recover_pending_writes()
+
+    assert read_db.load_books()[0] == read_db.parse_book(BOOK_1)
+
+def test_pending_journal_is_rolled_forward(database_dir):
+    books = str(database_dir / "books.txt")
+    borrows = str(database_dir / "borrows.txt")
+    (database_dir / "books.log").write_text("-|1", encoding="utf-8")
+    rows = (database_dir / "borrows.txt").read_text(encoding="utf-8").splitlines()
+    temp_path = write_db._write_temp(borrows, rows + ["999|1|4|2025-12-01|2025-12-08||borrowed"])
+    write_db._write_journal([(temp_path, borrows)], {books: ["-|15"]})
+
+    write_db.recover_pending_writes()
+
+    assert not (database_dir / "transaction.journal").exists()
+    assert list(database_dir.glob("*.tmp")) == []
+    assert 1 in book_ids() and 15 not in book_ids()
+    assert read_db.load_borrows()[-1].borrow_id == 999
+
+def test_interrupted_journal_replay_is_idempotent(database_dir):
+    books = str(database_dir / "books.txt")
+    (database_dir / "books.log").write_text("-|15\n", encoding="utf-8")
+    write_db._write_journal([], {books: ["-|15", "+|1|First|Tahmima Anam|9789848823456|2007|5"]})
+
+    write_db.recover_pending_writes()
+
+    assert 15 not in book_ids()
+    assert read_db.load_books()[0]["title"] == "First"
+
+def test_malformed_log_line_keeps_previous_record(database_dir):
+    (database_dir / "books.log").write_text("+|5|garbage\n", encoding="utf-8")
+    errors = []
+
+    books = {book["id"]: book for book in read_db.load_books(errors)}
+
+    assert books[5]["title"] == "The Last Cartographer"
+    assert [(line_no, line) for _, line_no, line, _ in errors] == [(1, "5|garbage")]
@@ -0,0 +1,32 @@
+import random
+import pytest
+from helpers.records import Borrow, BorrowStatus
+from server.leaderboard import BorrowLeaderboard
+
+pytest.importorskip("numpy")
+
+from server.columns import BorrowColumns
+
+TODAY = 740_000
+
+def random_borrows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    statuses = [BorrowStatus.BORROWED, BorrowStatus.RETURNED]
+    return [
+        Borrow.from_days(borrow_id, rng.randint(1, 500), rng.randint(1, 300), day, day + 7, None, rng.choice(statuses))
+        for borrow_id, day in enumerate(sorted(rng.randint(TODAY - 400, TODAY) for _ in range(count)), 1)
+    ]
+
+@pytest.mark.parametrize("days", [1, 7, 30, 365])
+@pytest.mark.parametrize("limit", [1, 10, 50])
+def test_columns_top_window_matches_leaderboard(days, limit):
+    borrows = random_borrows(5000)
+    leaderboard = BorrowLeaderboard()
+    for borrow in borrows:
+        leaderboard.record(borrow.book_id, borrow.borrow_day)
+
+    built = BorrowColumns.build(borrows[:4000])
+    for borrow in borrows[4000:]:
+        built.add(borrow)
+
+    assert built.top_window(limit, days, TODAY) == leaderboard.top_window(limit, days, TODAY)
@@ -0,0 +1,41 @@
+import asyncio
+from helpers.sqlite_db import SQLiteStorage
+from server.repository import Repository
+
+BOOKS = [{"id": book_id, "title": f"Book {book_id}", "author": "Author", "isbn": f"978000000{book_id:04d}", "published_year": 2000, "available_copies": 2} for book_id in range(1, 1201)]
+USERS = [{"id": 1, "username": "asif_hasan", "full_name": "Asif Hasan", "email": "asif.hasan@example.bd"}]
+
+async def sync_between_workers(path: str):
+    first, second = (Repository(SQLiteStorage(path, shared=True)) for _ in range(2))
+    await first.start()
+    await second.start()
+    try:
+        async with first.transaction():
+            # More keys than fit in one IN (...) chunk.
+            for book_id in range(1, 1001):
+                await first.update_book(book_id, {"title": f"Renamed {book_id}"})
+            await first.delete_book(1200)
+            first.reserve_copy(7)
+            await first.borrow(1, 7)
+
+        await second.sync()
+        return second
+    finally:
+        await first.stop()
+        await second.stop()
+
+def test_remote_changes_are_applied(tmp_path):
+    path = str(tmp_path / "library.db")
+    storage = SQLiteStorage(path)
+    storage.import_records("books", BOOKS)
+    storage.import_records("users", USERS)
+    storage.stop()
+
+    repo = asyncio.run(sync_between_workers(path))
+
+    assert repo.books[1]["title"] == "Renamed 1"
+    assert repo.books[1000]["title"] == "Renamed 1000"
+    assert repo.books[1001]["title"] == "Book 1001"
+    assert 1200 not in repo.books
+    assert repo.books[7]["available_copies"] == 1
+    assert repo.active_loan(1, 7) is not None
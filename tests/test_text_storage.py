@@ -0,0 +1,89 @@
+import asyncio
+import os
+from helpers.storage import TextStorage
+from server.repository import Repository
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+async def update_title(repo: Repository, book_id: int, title: str):
+    await repo.start()
+    try:
+        await repo.update_book(book_id, {"title": title})
+    finally:
+        await repo.stop()
+
+def test_snapshot_write_skips_lines_the_loader_skipped(database_dir):
+    with open(database_dir / "books.txt", "a", encoding="utf-8") as file:
+        file.write("garbage line\n")
+
+    repo = Repository(TextStorage("snapshot"))
+    run(update_title(repo, 3, "Lal Shalu (2nd ed.)"))
+
+    lines = (database_dir / "books.txt").read_text(encoding="utf-8").splitlines()
+    assert "garbage line" not in lines
+    assert "3|Lal Shalu (2nd ed.)|Syed Waliullah|9789849001122|1950|3" in lines
+    assert len(lines) == len(repo.books)
+
+async def borrow(repo: Repository, user_id: int, book_id: int):
+    repo.reserve_copy(book_id)
+    return await repo.borrow(user_id, book_id)
+
+def fail_once(monkeypatch, module, name: str, path: str):
+    original = getattr(module, name)
+    calls = []
+
+    def failing(*args):
+        if str(args[-1]) == path and not calls:
+            calls.append(args)
+            raise OSError(f"simulated {name} failure")
+        return original(*args)
+
+    monkeypatch.setattr(module, name, failing)
+
+async def write_after_failure(repo: Repository, first, second):
+    await repo.start()
+    try:
+        try:
+            await first()
+        except OSError:
+            pass
+        await second()
+    finally:
+        await repo.stop()
+
+def load(database_dir, name: str):
+    return (database_dir / name).read_text(encoding="utf-8").splitlines()
+
+def test_write_after_failed_journal_cleanup_keeps_landed_rows(database_dir, monkeypatch):
+    fail_once(monkeypatch, os, "remove", str(database_dir / "transaction.journal"))
+    repo = Repository(TextStorage("snapshot"))
+    run(write_after_failure(
+        repo,
+        lambda: repo.update_book(1, {"title": "First"}),
+        lambda: repo.update_book(3, {"title": "Second"}),
+    ))
+
+    books = load(database_dir, "books.txt")
+    assert books[0].startswith("1|First|")
+    assert books[2].startswith("3|Second|")
+    assert not (database_dir / "transaction.journal").exists()
+
+def test_failed_rename_is_rolled_forward_before_reload(database_dir, monkeypatch):
+    fail_once(monkeypatch, os, "replace", str(database_dir / "borrows.txt"))
+    repo = Repository(TextStorage("snapshot"))
+    copies = repo.books[4]["available_copies"]
+    borrows = len(repo.borrows)
+    run(write_after_failure(
+        repo,
+        lambda: borrow(repo, 1, 4),
+        lambda: repo.update_book(3, {"title": "Second"}),
+    ))
+
+    # The journal was complete, so recovery finishes the borrow on both files
+    # and the reloaded repository agrees with them.
+    assert not (database_dir / "transaction.journal").exists()
+    assert repo.books[4]["available_copies"] == copies - 1
+    assert len(repo.borrows) == borrows + 1
+    assert len(load(database_dir, "borrows.txt")) == borrows + 1
+    assert load(database_dir, "books.txt")[3].endswith(f"|{copies - 1}")